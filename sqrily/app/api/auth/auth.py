@@ -351,14 +351,14 @@ async def get_current_user_info(
     logger.info("Getting current user info", user_id=str(current_user.id))
 
     return UserResponse(
-        id=str(current_user.id),
+        id=current_user.id,
         email=current_user.email,
         first_name=current_user.first_name,
         last_name=current_user.last_name,
         avatar_url=current_user.avatar_url,
-        provider=current_user.provider.value,
+        provider=current_user.provider,
         onboarding_completed=current_user.onboarding_completed,
-        subscription_tier=current_user.subscription_tier.value,
+        subscription_tier=current_user.subscription_tier,
         adhd_preferences=current_user.adhd_profile,
         created_at=current_user.created_at
     )
\ No newline at end of file
@@ -31,6 +31,7 @@ router = APIRouter()
 async def get_goals(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    after: Optional[UUID] = Query(None, description="Cursor from a previous response; overrides page"),
     status: Optional[List[str]] = Query(None, description="Filter by status"),
     fc_quadrant: Optional[List[int]] = Query(None, description="Filter by Sqrily quadrant"),
     role_category: Optional[List[str]] = Query(None, description="Filter by role category"),
@@ -59,7 +60,8 @@ async def get_goals(
         user_id=current_user.id,
         page=page,
         per_page=per_page,
-        filters=filters
+        filters=filters,
+        after=after
     )
 
 
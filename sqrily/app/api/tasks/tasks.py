@@ -17,7 +17,7 @@ from ...dependencies import get_current_user
 from ...models.user import User
 from ...schemas.task import (
     TaskCreate, TaskUpdate, TaskResponse, TaskListResponse,
-    TaskFilters, TaskActionRequest, TaskBreakdownRequest, TaskBreakdownResponse
+    TaskFilters, parse_task_filters, StartTaskAction, CompleteTaskAction, TaskBreakdownRequest, TaskBreakdownResponse
 )
 from ...services.task_service import TaskService
 from ...exceptions import TaskNotFoundError, ValidationError
@@ -30,6 +30,7 @@ router = APIRouter()
 async def get_tasks(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    after: Optional[UUID] = Query(None, description="Cursor from a previous response; overrides page"),
     status: Optional[List[str]] = Query(None, description="Filter by status"),
     task_type: Optional[List[str]] = Query(None, description="Filter by type"),
     complexity_level: Optional[List[str]] = Query(None, description="Filter by complexity"),
@@ -46,21 +47,22 @@ async def get_tasks(
     """
     logger.info("Fetching tasks", user_id=str(current_user.id), page=page, per_page=per_page)
 
-    # Create filters object
-    filters = TaskFilters(
-        status=status,
-        task_type=task_type,
-        complexity_level=complexity_level,
-        fc_quadrant=fc_quadrant,
-        goal_id=goal_id
-    )
+    # Create filters object (cached per filter shape across pages)
+    filters = parse_task_filters({
+        "status": status,
+        "task_type": task_type,
+        "complexity_level": complexity_level,
+        "fc_quadrant": fc_quadrant,
+        "goal_id": goal_id
+    })
 
     task_service = TaskService(db)
     return await task_service.get_user_tasks(
         user_id=current_user.id,
         page=page,
         per_page=per_page,
-        filters=filters
+        filters=filters,
+        after=after
     )
 
 
@@ -211,7 +213,7 @@ async def delete_task(
 
 @router.post("/{task_id}/start", response_model=TaskResponse)
 async def start_task(
-    action_data: TaskActionRequest,
+    action_data: StartTaskAction,
     task_id: UUID = Path(..., description="Task ID"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -239,7 +241,7 @@ async def start_task(
 
 @router.post("/{task_id}/complete", response_model=TaskResponse)
 async def complete_task(
-    action_data: TaskActionRequest,
+    action_data: CompleteTaskAction,
     task_id: UUID = Path(..., description="Task ID"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -8,6 +8,7 @@ from ...dependencies import get_current_user
 from ...models.user import User
 from ...schemas.auth import UserResponse
 from ...schemas.user import UserUpdate, ADHDProfileUpdate
+from ...services.goal_service import invalidate_overwhelm_threshold
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -20,14 +21,14 @@ async def get_current_user_profile(
     logger.info("Getting user profile", user_id=str(current_user.id))
 
     return UserResponse(
-        id=str(current_user.id),
+        id=current_user.id,
         email=current_user.email,
         first_name=current_user.first_name,
         last_name=current_user.last_name,
         avatar_url=current_user.avatar_url,
-        provider=current_user.provider.value,
+        provider=current_user.provider,
         onboarding_completed=current_user.onboarding_completed,
-        subscription_tier=current_user.subscription_tier.value,
+        subscription_tier=current_user.subscription_tier,
         adhd_preferences=current_user.adhd_profile,
         created_at=current_user.created_at
     )
@@ -55,14 +56,14 @@ async def update_user_profile(
     db.refresh(current_user)
 
     return UserResponse(
-        id=str(current_user.id),
+        id=current_user.id,
         email=current_user.email,
         first_name=current_user.first_name,
         last_name=current_user.last_name,
         avatar_url=current_user.avatar_url,
-        provider=current_user.provider.value,
+        provider=current_user.provider,
         onboarding_completed=current_user.onboarding_completed,
-        subscription_tier=current_user.subscription_tier.value,
+        subscription_tier=current_user.subscription_tier,
         adhd_preferences=current_user.adhd_profile,
         created_at=current_user.created_at
     )
@@ -98,6 +99,9 @@ async def update_adhd_profile(
     db.commit()
     db.refresh(current_user)
 
+    # Drop the cached overwhelm threshold so the new value applies now
+    invalidate_overwhelm_threshold(current_user.id)
+
     return {
         "message": "ADHD profile updated successfully",
         "adhd_profile": current_user.adhd_profile,
@@ -16,6 +16,9 @@ class Settings(BaseSettings):
     # Database
     database_url: Optional[str] = None
     database_echo: bool = False
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout: int = 30
     
     # JWT and Security
     jwt_secret_key: str = "dev-secret-key-change-in-production"
@@ -36,6 +39,7 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4-1106-preview"
     openai_max_tokens: int = 4096
     openai_temperature: float = 0.7
+    openai_max_concurrency: int = 8
     
     # Redis
     redis_url: Optional[str] = "redis://localhost:6379"
@@ -43,6 +47,9 @@ class Settings(BaseSettings):
     # Celery
     celery_broker_url: Optional[str] = None
     celery_result_backend: Optional[str] = None
+    # Greenlet count for the gevent worker pool - the tasks are I/O-bound
+    # (DB round-trips, OpenAI calls), so hundreds can overlap their waits
+    celery_worker_concurrency: int = 200
     
     # CORS - Environment specific configuration
     allowed_origins: List[str] = []
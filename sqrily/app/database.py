@@ -1,23 +1,55 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+import orjson
 import structlog
+from contextlib import contextmanager
 from typing import Generator
 
 from .config import settings
 
 logger = structlog.get_logger()
 
+def _json_serializer(value) -> str:
+    """Serialize JSON column values with orjson (C, SIMD-accelerated)"""
+    # orjson emits bytes; DBAPI drivers expect str for JSON parameters
+    return orjson.dumps(value).decode()
+
 # Database engine
+if "sqlite" in settings.database_url:
+    # SQLite development databases share one connection; pool sizing
+    # does not apply
+    _engine_kwargs = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False}
+    }
+else:
+    # PostgreSQL pool sized for concurrent request traffic. Keep
+    # worker_count x (pool_size + max_overflow) below the server's
+    # max_connections when scaling out.
+    _engine_kwargs = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        # Batch executemany flows at the driver level: insertmanyvalues
+        # folds bulk INSERTs into multi-VALUES statements, and
+        # values_plus_batch routes remaining executemany UPDATE/DELETE
+        # through psycopg2's fast execution helpers
+        "insertmanyvalues_page_size": 1000,
+        "executemany_mode": "values_plus_batch"
+    }
+
 engine = create_engine(
     settings.database_url,
     echo=settings.database_echo,
     future=True,
     pool_pre_ping=True,
     pool_recycle=300,
-    poolclass=StaticPool if "sqlite" in settings.database_url else None,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **_engine_kwargs
 )
 
 # Session factory
@@ -28,15 +60,57 @@ SessionLocal = sessionmaker(
     future=True
 )
 
+if settings.debug:
+    # Development-only N+1 guard: flag any implicit per-instance lazy load
+    # so new N+1 patterns surface in the logs instead of shipping. The
+    # unbounded collections already use lazy="raise"; this catches the
+    # remaining many-to-one and small-collection attributes.
+    from sqlalchemy import event
+
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _warn_on_lazy_load(orm_execute_state):
+        # lazy_loaded_from raises on non-SELECT executions (statement
+        # UPDATE/DELETE), so only inspect loads
+        if not orm_execute_state.is_select:
+            return
+        parent = orm_execute_state.lazy_loaded_from
+        if parent is not None:
+            logger.warning(
+                "Implicit lazy load - consider selectinload/joinedload",
+                entity=parent.class_.__name__,
+                identity=str(parent.identity)
+            )
+
 # Base class for models
 Base = declarative_base()
 metadata = MetaData()
 
+# JSON type that upgrades to JSONB on PostgreSQL so containment (@>) queries
+# can use GIN indexes, while SQLite development databases keep plain JSON
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+def raw_scalar(db: Session, stmt):
+    """Run a Core statement on the session's connection and return the
+    first column of the first row.
+
+    Skips the ORM execution layer entirely - no autoflush, no
+    do_orm_execute hooks, no ORM result wrapping - which is worth it for
+    hot paths that only want a single aggregate value. The statement
+    stays a Core construct so it compiles per-dialect instead of
+    hardcoding a driver paramstyle.
+    """
+    return db.connection().execute(stmt).scalar()
+
+
 def get_db() -> Generator[Session, None, None]:
     """Dependency to get database session"""
     db = SessionLocal()
     try:
         yield db
+        # Request-scoped unit of work: anything flushed but not yet
+        # committed by a service becomes durable here, so an endpoint's
+        # writes share one fsync instead of paying one per service call
+        db.commit()
     except Exception as e:
         logger.error("Database session error", error=str(e))
         db.rollback()
@@ -44,6 +118,26 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+@contextmanager
+def session_scope() -> Generator[Session, None, None]:
+    """Transactional scope for code outside the request cycle.
+
+    Background tasks used to pull a session via next(get_db()) and close
+    it by hand, which leaks the connection whenever an exception fires
+    before close() - under gevent concurrency that exhausts the pool.
+    Commit, rollback and close are deterministic here.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 class DatabaseMixin:
     """Mixin class to add common database methods"""
     
@@ -2,7 +2,7 @@ from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 import structlog
 import uvicorn
@@ -11,6 +11,7 @@ import uuid
 
 from .config import settings
 from .database import engine, Base, get_db
+from .utils.time import set_request_now, reset_request_now
 from .dependencies import get_current_user
 from .api.auth import router as auth_router
 from .api.users import router as users_router
@@ -52,7 +53,10 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    debug=settings.debug
+    debug=settings.debug,
+    # orjson serializes responses ~3-10x faster than stdlib json and
+    # handles UUID/datetime natively
+    default_response_class=ORJSONResponse
 )
 
 # Security
@@ -83,6 +87,16 @@ if not settings.debug:
         allowed_hosts=["*"]  # Configure this for production
     )
 
+# Request-scoped clock - capture "now" once per request so model timestamp
+# updates share a single datetime instead of re-reading the clock per row
+@app.middleware("http")
+async def request_clock_middleware(request, call_next):
+    token = set_request_now()
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_now(token)
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
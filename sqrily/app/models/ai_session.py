@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -6,6 +6,7 @@ import uuid
 import enum
 
 from ..database import Base, DatabaseMixin
+from ..utils.time import now
 
 class SessionType(str, enum.Enum):
     COLLABORATION = "collaboration"
@@ -27,7 +28,15 @@ class CollaborationMode(str, enum.Enum):
 
 class AISession(Base, DatabaseMixin):
     __tablename__ = "ai_sessions"
-    
+
+    __table_args__ = (
+        # The overwhelm sweep counts each user's sessions from the last
+        # 24h; (user_id, created_at DESC) makes that a range scan
+        Index("ix_ai_sessions_user_created", "user_id", text("created_at DESC")),
+        # The 30-day cleanup batches delete by created_at alone
+        Index("ix_ai_sessions_created", "created_at"),
+    )
+
     # Primary identification
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -74,8 +83,8 @@ class AISession(Base, DatabaseMixin):
     total_cost = Column(Float, default=0.0)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     completed_at = Column(DateTime, nullable=True)
     last_message_at = Column(DateTime, nullable=True)
     
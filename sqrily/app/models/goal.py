@@ -1,11 +1,12 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 import enum
 
-from ..database import Base, DatabaseMixin
+from ..database import Base, DatabaseMixin, JSONType
+from ..utils.time import now
 
 class SqrilyQuadrant(int, enum.Enum):
     """Sqrily Time Management Matrix Quadrants"""
@@ -20,9 +21,36 @@ class GoalStatus(str, enum.Enum):
     PAUSED = "paused"
     ARCHIVED = "archived"
 
+# Module-level lookup table - built once, not per property call
+_QUADRANT_NAMES = {
+    1: "Urgent & Important",
+    2: "Not Urgent & Important",
+    3: "Urgent & Not Important",
+    4: "Not Urgent & Not Important"
+}
+
 class Goal(Base, DatabaseMixin):
     __tablename__ = "goals"
-    
+    __table_args__ = (
+        # Partial composite index matching the listing predicate
+        # (user_id, deleted_at IS NULL) and its sort order, so the
+        # paginated query walks the index instead of sorting a heap scan
+        Index(
+            "ix_goals_user_active_prio",
+            "user_id",
+            text("priority_level DESC"),
+            text("created_at DESC"),
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        # GIN index backing the values_alignment containment filter
+        Index(
+            "ix_goals_values_gin",
+            "values_alignment",
+            postgresql_using="gin",
+            postgresql_ops={"values_alignment": "jsonb_path_ops"}
+        ),
+    )
+
     # Primary identification
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -33,7 +61,8 @@ class Goal(Base, DatabaseMixin):
     
     # Sqrily integration
     fc_quadrant = Column(Integer, nullable=True)  # 1-4 for Sqrily quadrants
-    values_alignment = Column(JSON, nullable=True)  # List of values this goal aligns with
+    # JSONB on PostgreSQL so values containment (@>) filters hit the GIN index
+    values_alignment = Column(JSONType, nullable=True)  # List of values this goal aligns with
     mission_connection = Column(Text, nullable=True)  # How this connects to personal mission
     role_category = Column(String(100), nullable=True)  # professional, personal, self_care, etc.
     
@@ -48,7 +77,8 @@ class Goal(Base, DatabaseMixin):
     
     # AI-generated insights
     ai_breakdown = Column(JSON, nullable=True)  # AI-generated phases and tasks
-    ai_insights = Column(JSON, nullable=True)  # AI analysis and recommendations
+    # JSONB on PostgreSQL so progress notes can be appended with jsonb_set
+    ai_insights = Column(JSONType, nullable=True)  # AI analysis and recommendations
     ai_confidence = Column(Float, nullable=True)  # AI confidence score
     
     # ADHD-specific
@@ -57,15 +87,16 @@ class Goal(Base, DatabaseMixin):
     overwhelm_risk = Column(String(20), default="medium")  # low, medium, high
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     completed_at = Column(DateTime, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
     
-    # Relationships
+    # Relationships - collections raise on implicit lazy SQL so N+1 loads
+    # have to be requested explicitly via selectinload()
     user = relationship("User", back_populates="goals")
-    tasks = relationship("Task", back_populates="goal", cascade="all, delete-orphan")
-    milestones = relationship("Milestone", back_populates="goal", cascade="all, delete-orphan")
+    tasks = relationship("Task", back_populates="goal", lazy="raise_on_sql", cascade="all, delete-orphan")
+    milestones = relationship("Milestone", back_populates="goal", lazy="raise_on_sql", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Goal(id={self.id}, title={self.title}, quadrant={self.fc_quadrant})>"
@@ -73,37 +104,31 @@ class Goal(Base, DatabaseMixin):
     @property
     def quadrant_name(self) -> str:
         """Get human-readable quadrant name"""
-        quadrant_names = {
-            1: "Urgent & Important",
-            2: "Not Urgent & Important", 
-            3: "Urgent & Not Important",
-            4: "Not Urgent & Not Important"
-        }
-        return quadrant_names.get(self.fc_quadrant, "Unassigned")
+        return _QUADRANT_NAMES.get(self.fc_quadrant, "Unassigned")
     
     @property
     def is_overdue(self) -> bool:
         """Check if goal is overdue"""
         if self.target_date and self.status == GoalStatus.ACTIVE:
-            return datetime.utcnow() > self.target_date
+            return now() > self.target_date
         return False
     
     @property
     def days_until_target(self) -> int:
         """Days until target date (negative if overdue)"""
         if self.target_date:
-            delta = self.target_date - datetime.utcnow()
+            delta = self.target_date - now()
             return delta.days
         return 0
     
     def update_progress(self, percentage: float):
         """Update progress percentage"""
         self.progress_percentage = max(0.0, min(100.0, percentage))
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
         
         if self.progress_percentage >= 100.0 and self.status == GoalStatus.ACTIVE:
             self.status = GoalStatus.COMPLETED
-            self.completed_at = datetime.utcnow()
+            self.completed_at = now()
     
     def get_ai_recommendation(self, key: str, default=None):
         """Get AI recommendation by key"""
@@ -117,7 +142,7 @@ class Goal(Base, DatabaseMixin):
             self.ai_insights = {}
         
         self.ai_insights[key] = value
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
     
     def calculate_quadrant_score(self, urgency: int, importance: int) -> int:
         """Calculate Sqrily quadrant based on urgency and importance scores"""
@@ -143,8 +168,8 @@ class Milestone(Base, DatabaseMixin):
     is_completed = Column(Boolean, default=False)
     completed_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     
     # Relationships
     goal = relationship("Goal", back_populates="milestones")
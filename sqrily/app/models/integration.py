@@ -1,11 +1,12 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, ForeignKey, Boolean, Index, text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
 import enum
 
 from ..database import Base, DatabaseMixin
+from ..utils.time import now
 
 class IntegrationProvider(str, enum.Enum):
     GOOGLE_CALENDAR = "google_calendar"
@@ -29,7 +30,17 @@ class SyncDirection(str, enum.Enum):
 
 class Integration(Base, DatabaseMixin):
     __tablename__ = "integrations"
-    
+    __table_args__ = (
+        # Partial index so the background token refresher can range-scan the
+        # tiny set of near-expiry active integrations instead of seq-scanning
+        # the whole table every minute.
+        Index(
+            "ix_integrations_refresh_due",
+            "token_expires_at",
+            postgresql_where=text("status = 'active' AND token_expires_at IS NOT NULL")
+        ),
+    )
+
     # Primary identification
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -76,8 +87,8 @@ class Integration(Base, DatabaseMixin):
     last_error_at = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     connected_at = Column(DateTime, nullable=True)
     disconnected_at = Column(DateTime, nullable=True)
     
@@ -98,7 +109,7 @@ class Integration(Base, DatabaseMixin):
         """Check if access token is expired"""
         if not self.token_expires_at:
             return False
-        return datetime.utcnow() > self.token_expires_at
+        return now() > self.token_expires_at
     
     @property
     def needs_refresh(self) -> bool:
@@ -106,30 +117,45 @@ class Integration(Base, DatabaseMixin):
         if not self.token_expires_at:
             return False
         # Refresh if token expires within 10 minutes
-        return (self.token_expires_at - datetime.utcnow()).total_seconds() < 600
-    
+        return (self.token_expires_at - now()).total_seconds() < 600
+
+    @classmethod
+    def get_refresh_due(cls, db, within_seconds: int = 600):
+        """Get active integrations whose tokens expire soon.
+
+        Uses the ix_integrations_refresh_due partial index, so background
+        refreshers should prefer this over loading rows and checking the
+        needs_refresh property in Python.
+        """
+        cutoff = now() + timedelta(seconds=within_seconds)
+        return db.query(cls).filter(
+            cls.status == IntegrationStatus.ACTIVE,
+            cls.token_expires_at.isnot(None),
+            cls.token_expires_at < cutoff
+        ).all()
+
     def activate(self):
         """Activate the integration"""
         self.status = IntegrationStatus.ACTIVE
-        self.connected_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.connected_at = now()
+        self.updated_at = now()
     
     def disconnect(self, reason: str = None):
         """Disconnect the integration"""
         self.status = IntegrationStatus.DISCONNECTED
-        self.disconnected_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.disconnected_at = now()
+        self.updated_at = now()
         
         if reason:
             self.last_error = f"Disconnected: {reason}"
-            self.last_error_at = datetime.utcnow()
+            self.last_error_at = now()
     
     def record_sync_success(self, items_count: int = 0):
         """Record successful sync"""
-        self.last_sync_at = datetime.utcnow()
+        self.last_sync_at = now()
         self.total_syncs += 1
         self.items_synced += items_count
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
         
         # Clear error status if it was in error state
         if self.status == IntegrationStatus.ERROR:
@@ -139,9 +165,9 @@ class Integration(Base, DatabaseMixin):
         """Record sync error"""
         self.sync_errors += 1
         self.last_error = error_message
-        self.last_error_at = datetime.utcnow()
+        self.last_error_at = now()
         self.status = IntegrationStatus.ERROR
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
     
     def get_health_score(self) -> float:
         """Calculate integration health score (0-1)"""
@@ -153,7 +179,7 @@ class Integration(Base, DatabaseMixin):
         
         # Adjust for recent activity
         if self.last_sync_at:
-            hours_since_sync = (datetime.utcnow() - self.last_sync_at).total_seconds() / 3600
+            hours_since_sync = (now() - self.last_sync_at).total_seconds() / 3600
             if hours_since_sync > 24:
                 base_score *= 0.8  # Reduce score if no recent sync
         
@@ -172,13 +198,13 @@ class Integration(Base, DatabaseMixin):
         
         if feature not in self.features_enabled:
             self.features_enabled.append(feature)
-            self.updated_at = datetime.utcnow()
+            self.updated_at = now()
     
     def disable_feature(self, feature: str):
         """Disable a specific feature"""
         if self.features_enabled and feature in self.features_enabled:
             self.features_enabled.remove(feature)
-            self.updated_at = datetime.utcnow()
+            self.updated_at = now()
 
 class SyncLog(Base, DatabaseMixin):
     """Log entries for integration sync operations"""
@@ -208,7 +234,7 @@ class SyncLog(Base, DatabaseMixin):
     # Metadata
     sync_metadata = Column(JSON, nullable=True)  # Provider-specific sync data
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     integration = relationship("Integration", back_populates="sync_logs")
@@ -1,11 +1,12 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean, Index, Enum, Table, text, insert, update, Computed, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 import enum
 
-from ..database import Base, DatabaseMixin
+from ..database import Base, DatabaseMixin, JSONType
+from ..utils.time import now
 
 class SubtaskType(str, enum.Enum):
     PREPARATION = "preparation"
@@ -24,26 +25,77 @@ class SubtaskStatus(str, enum.Enum):
     COMPLETED = "completed"
     SKIPPED = "skipped"
 
+# Self-referential join table for subtask dependencies. A proper M2M with
+# btree indexes keeps "is X blocked?" an index scan, where the previous
+# JSON array column forced scanning every row's array.
+subtask_dependencies = Table(
+    "subtask_dependencies",
+    Base.metadata,
+    Column("subtask_id", UUID(as_uuid=True), ForeignKey("subtasks.id"), primary_key=True),
+    Column("depends_on_id", UUID(as_uuid=True), ForeignKey("subtasks.id"), primary_key=True),
+    Index("ix_subtask_dependencies_depends_on", "depends_on_id"),
+)
+
+# Module-level lookup table - built once, not per property call
+_DIFFICULTY_WEIGHTS = {
+    SubtaskDifficulty.EASY: 1.0,
+    SubtaskDifficulty.MEDIUM: 2.0,
+    SubtaskDifficulty.HARD: 3.0
+}
+
 class Subtask(Base, DatabaseMixin):
     __tablename__ = "subtasks"
-    
+    __table_args__ = (
+        # GIN index for containment (@>) lookups on completion indicators
+        Index(
+            "ix_subtasks_success_indicators",
+            "success_indicators",
+            postgresql_using="gin",
+            postgresql_ops={"success_indicators": "jsonb_path_ops"}
+        ),
+        # Composite index for listing a task's subtasks filtered by status
+        Index("ix_subtasks_task_status", "task_id", "status"),
+        # Ownership checks filter on the denormalized user_id; the
+        # composite keeps the per-task listing path on an index too
+        Index("ix_subtasks_user_task", "user_id", "task_id"),
+        # Partial index so ordering the remaining subtasks of a task is an
+        # index-only scan
+        Index(
+            "ix_subtasks_task_seq",
+            "task_id",
+            "sequence_order",
+            postgresql_where=text("status != 'completed'")
+        ),
+    )
+
     # Primary identification
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
-    
+    # Denormalized from the parent task so ownership checks are a direct
+    # filter instead of a Subtask JOIN tasks per call
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+
     # Basic info
     title = Column(String(255), nullable=False)
     action = Column(Text, nullable=True)  # Specific action to take
     completion_criteria = Column(Text, nullable=True)  # How to know it's done
     
-    # Sequencing and dependencies
+    # Sequencing
     sequence_order = Column(Integer, default=1)  # Order within the parent task
-    depends_on_subtask_ids = Column(JSON, nullable=True)  # List of prerequisite subtask IDs
     
-    # Classification
-    subtask_type = Column(String(20), default=SubtaskType.EXECUTION)
-    difficulty_level = Column(String(20), default=SubtaskDifficulty.MEDIUM)
-    status = Column(String(20), default=SubtaskStatus.PENDING)
+    # Classification (native enums - stored by value to match API strings)
+    subtask_type = Column(
+        Enum(SubtaskType, name="subtask_type", values_callable=lambda e: [m.value for m in e]),
+        default=SubtaskType.EXECUTION
+    )
+    difficulty_level = Column(
+        Enum(SubtaskDifficulty, name="subtask_difficulty", values_callable=lambda e: [m.value for m in e]),
+        default=SubtaskDifficulty.MEDIUM
+    )
+    status = Column(
+        Enum(SubtaskStatus, name="subtask_status", values_callable=lambda e: [m.value for m in e]),
+        default=SubtaskStatus.PENDING
+    )
     
     # Time estimates
     estimated_minutes = Column(Integer, default=15)
@@ -53,7 +105,7 @@ class Subtask(Base, DatabaseMixin):
     energy_required = Column(Integer, default=5)     # 1-10 scale
     focus_required = Column(Integer, default=5)      # 1-10 scale
     initiation_support = Column(Text, nullable=True) # Specific guidance to start
-    success_indicators = Column(JSON, nullable=True) # Signs of completion
+    success_indicators = Column(JSONType, nullable=True) # Signs of completion (JSONB on PostgreSQL)
     dopamine_reward = Column(Text, nullable=True)    # Reward/celebration suggestion
     
     # Executive function support
@@ -67,39 +119,62 @@ class Subtask(Base, DatabaseMixin):
     # Progress and motivation
     momentum_builder = Column(Boolean, default=False) # Designed to build momentum
     confidence_boost = Column(Boolean, default=False) # Designed to boost confidence
+
+    # Generated column mirroring cognitive_load_score so the DB maintains
+    # it at write time and queries can sort/filter on it directly
+    cognitive_load = Column(
+        Float,
+        Computed(
+            "(CASE difficulty_level"
+            " WHEN 'easy' THEN 1.0"
+            " WHEN 'hard' THEN 3.0"
+            " ELSE 2.0 END)"
+            " * (1 + energy_required / 10.0 + focus_required / 10.0) / 3",
+            persisted=True
+        )
+    )
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
     # Relationships
     task = relationship("Task", back_populates="subtasks")
-    
+    # Prerequisite subtasks via the join table; selectin loading resolves
+    # dependencies for a whole batch of subtasks in one extra query
+    dependencies = relationship(
+        "Subtask",
+        secondary=subtask_dependencies,
+        primaryjoin=lambda: Subtask.id == subtask_dependencies.c.subtask_id,
+        secondaryjoin=lambda: Subtask.id == subtask_dependencies.c.depends_on_id,
+        lazy="selectin"
+    )
+
     def __repr__(self):
         return f"<Subtask(id={self.id}, title={self.title}, status={self.status})>"
-    
+
+    @property
+    def depends_on_subtask_ids(self) -> list:
+        """IDs of prerequisite subtasks (backed by the join table)"""
+        return [dep.id for dep in self.dependencies]
+
     @property
     def is_blocked(self) -> bool:
         """Check if subtask is blocked by incomplete dependencies"""
-        if not self.depends_on_subtask_ids:
-            return False
-        
-        # TODO: Query dependent subtasks to check completion
-        # For now, assume not blocked
-        return False
+        return any(
+            dep.status != SubtaskStatus.COMPLETED for dep in self.dependencies
+        )
     
     @property
     def cognitive_load_score(self) -> float:
         """Calculate cognitive load based on difficulty, energy, and focus requirements"""
-        difficulty_weights = {
-            SubtaskDifficulty.EASY: 1.0,
-            SubtaskDifficulty.MEDIUM: 2.0,
-            SubtaskDifficulty.HARD: 3.0
-        }
-        
-        base_load = difficulty_weights.get(self.difficulty_level, 2.0)
+        # Prefer the DB-maintained generated column; compute in Python
+        # only for unflushed instances
+        if self.cognitive_load is not None:
+            return self.cognitive_load
+        base_load = _DIFFICULTY_WEIGHTS.get(self.difficulty_level, 2.0)
         energy_factor = self.energy_required / 10.0
         focus_factor = self.focus_required / 10.0
         
@@ -116,22 +191,111 @@ class Subtask(Base, DatabaseMixin):
         """Mark subtask as started"""
         if self.can_start():
             self.status = SubtaskStatus.IN_PROGRESS
-            self.started_at = datetime.utcnow()
-            self.updated_at = datetime.utcnow()
+            self.started_at = now()
+            self.updated_at = now()
     
     def complete_subtask(self, actual_minutes: int = None):
         """Mark subtask as completed"""
         self.status = SubtaskStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.completed_at = now()
+        self.updated_at = now()
         
         if actual_minutes:
             self.actual_minutes = actual_minutes
     
+    @classmethod
+    def pickable_for(cls, session, task_ids, user_energy: int, user_confidence: int):
+        """IDs of pending subtasks appropriate for the user's current state.
+
+        Batch scheduling previously implied instantiating every candidate
+        subtask and calling is_momentum_appropriate per object. The same
+        momentum rule expressed as a WHERE clause lets the database filter
+        and return only matching IDs - no ORM objects, no Python loop.
+        """
+        if not task_ids:
+            return []
+
+        query = session.query(cls.id).filter(
+            cls.task_id.in_(task_ids),
+            cls.status == SubtaskStatus.PENDING
+        )
+        # Momentum builders are reserved for low energy/confidence moments
+        if user_energy > 5 and user_confidence > 5:
+            query = query.filter(cls.momentum_builder.is_(False))
+
+        return [row.id for row in query]
+
+    @classmethod
+    def bulk_create(cls, session, task_id, user_id, items):
+        """Insert many subtasks (e.g. an AI breakdown) in one statement.
+
+        Adding N AI-generated subtasks one session.add() at a time costs
+        N INSERT round-trips; a single multi-VALUES insert() lets the
+        server plan once and write once. Items are dicts of column
+        values; sequence_order defaults to their position. Returns the
+        new subtask IDs in insert order.
+        """
+        if not items:
+            return []
+
+        rows = [
+            {"task_id": task_id, "user_id": user_id, "sequence_order": position, **item}
+            for position, item in enumerate(items, 1)
+        ]
+        result = session.execute(
+            insert(cls).returning(cls.id, sort_by_parameter_order=True),
+            rows
+        )
+        return [row.id for row in result]
+
+    @classmethod
+    def bulk_complete(cls, session, subtask_ids, actual_minutes: dict = None):
+        """Complete many subtasks in a single UPDATE.
+
+        Marking N subtasks done one ORM instance at a time costs N
+        round-trips; batch completion from the scheduling UI collapses to
+        one UPDATE ... WHERE id IN (...). Returns the IDs actually
+        updated. Per-subtask actual_minutes (keyed by subtask ID) are
+        applied in a second batched statement when provided.
+        """
+        if not subtask_ids:
+            return []
+
+        completed_at = now()
+        result = session.execute(
+            update(cls)
+            .where(cls.id.in_(subtask_ids))
+            .values(
+                status=SubtaskStatus.COMPLETED,
+                completed_at=completed_at,
+                updated_at=completed_at
+            )
+            .returning(cls.id)
+        )
+        updated_ids = [row.id for row in result]
+
+        if actual_minutes:
+            # Normalize keys - callers may pass UUIDs or their string form
+            minutes_by_id = {str(k): v for k, v in actual_minutes.items()}
+            by_duration = {}
+            for subtask_id in updated_ids:
+                minutes = minutes_by_id.get(str(subtask_id))
+                if minutes is not None:
+                    by_duration.setdefault(minutes, []).append(subtask_id)
+            # One UPDATE per distinct duration instead of one per row
+            for minutes, ids in by_duration.items():
+                session.execute(
+                    update(cls)
+                    .where(cls.id.in_(ids))
+                    .values(actual_minutes=minutes)
+                )
+
+        return updated_ids
+
     def skip_subtask(self, reason: str = None):
         """Mark subtask as skipped"""
         self.status = SubtaskStatus.SKIPPED
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
         # TODO: Store skip reason if needed
     
     def get_next_action(self) -> str:
@@ -155,10 +319,16 @@ class Subtask(Base, DatabaseMixin):
         """Get clear signal that subtask is complete"""
         if self.completion_criteria:
             return self.completion_criteria
-        elif self.success_indicators:
-            return " and ".join(self.success_indicators)
-        else:
-            return f"You have completed: {self.title}"
+        indicators = self.success_indicators
+        if indicators:
+            if len(indicators) == 1:
+                return indicators[0]
+            # Memoize the joined string - indicators rarely change within
+            # an instance's lifetime but the signal is read repeatedly
+            return self.__dict__.setdefault(
+                "_completion_signal", " and ".join(indicators)
+            )
+        return f"You have completed: {self.title}"
 
 class MicroTask(Base, DatabaseMixin):
     """Ultra-small tasks for severe executive dysfunction support"""
@@ -185,8 +355,8 @@ class MicroTask(Base, DatabaseMixin):
     confidence_boost = Column(Boolean, default=True)
     momentum_builder = Column(Boolean, default=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     
     # Relationships
     subtask = relationship("Subtask")
@@ -198,5 +368,5 @@ class MicroTask(Base, DatabaseMixin):
     def complete(self):
         """Mark micro task as completed"""
         self.is_completed = True
-        self.completed_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
\ No newline at end of file
+        self.completed_at = now()
+        self.updated_at = now()
\ No newline at end of file
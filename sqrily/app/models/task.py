@@ -1,11 +1,13 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, Float, JSON, ForeignKey, Boolean, Index, Enum, text, Computed, func, event, table, column, update
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm.attributes import get_history
 from datetime import datetime
 import uuid
 import enum
 
-from ..database import Base, DatabaseMixin
+from ..database import Base, DatabaseMixin, JSONType
+from ..utils.time import now
 
 class TaskStatus(str, enum.Enum):
     PENDING = "pending"
@@ -28,9 +30,122 @@ class TaskType(str, enum.Enum):
     ADMIN = "admin"
     CREATIVE = "creative"
 
+# Module-level lookup tables - built once, not per property/method call
+_QUADRANT_NAMES = {
+    1: "Urgent & Important",
+    2: "Not Urgent & Important",
+    3: "Urgent & Not Important",
+    4: "Not Urgent & Not Important"
+}
+
+_COMPLEXITY_ADJUSTMENTS = {
+    TaskComplexity.MICRO: 0.5,
+    TaskComplexity.SIMPLE: 0.2,
+    TaskComplexity.MEDIUM: 0,
+    TaskComplexity.COMPLEX: -0.5
+}
+
 class Task(Base, DatabaseMixin):
     __tablename__ = "tasks"
-    
+    __table_args__ = (
+        # GIN indexes keep JSON containment (@>) filters on AI suggestions
+        # and context tags from degrading to sequential scans
+        Index(
+            "ix_tasks_ai_suggestions",
+            "ai_suggestions",
+            postgresql_using="gin",
+            postgresql_ops={"ai_suggestions": "jsonb_path_ops"}
+        ),
+        Index(
+            "ix_tasks_context_tags",
+            "context_tags",
+            postgresql_using="gin",
+            postgresql_ops={"context_tags": "jsonb_path_ops"}
+        ),
+        # Composite index for dashboard queries filtering by user, status
+        # and deadline
+        Index("ix_tasks_user_status_due", "user_id", "status", "due_date"),
+        # Partial index covering the is_overdue / is_due_soon predicates -
+        # only live, unfinished tasks carry index entries
+        Index(
+            "ix_tasks_user_due_active",
+            "user_id",
+            "due_date",
+            postgresql_where=text(
+                "status NOT IN ('completed', 'cancelled') AND deleted_at IS NULL"
+            )
+        ),
+        # Matches the default ordering of get_user_tasks (priority desc)
+        Index("ix_tasks_user_status_priority", "user_id", "status", text("ai_priority_score DESC")),
+        # Partial index matching the get_user_tasks listing predicate and
+        # sort order, so keyset pagination seeks instead of scanning
+        Index(
+            "ix_tasks_user_active_prio",
+            "user_id",
+            text("ai_priority_score DESC"),
+            text("created_at DESC"),
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        # Partial index so sorting pending tasks by the persisted priority
+        # score is index-only
+        Index(
+            "ix_tasks_user_priority_pending",
+            "user_id",
+            text("ai_priority_score DESC"),
+            postgresql_where=text("status = 'pending'")
+        ),
+        # Partial composite index feeding the grouped per-goal counts:
+        # (goal_id, status) over live rows makes both the total and the
+        # completed-task aggregation index-only
+        Index(
+            "ix_tasks_goal_status_active",
+            "goal_id",
+            "status",
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        # Partial index over the generated needs_breakdown column so
+        # "tasks needing breakdown" lists are index-only
+        Index(
+            "ix_tasks_user_needs_breakdown",
+            "user_id",
+            postgresql_where=text("needs_breakdown")
+        ),
+        # Partial composites matching the optional get_user_tasks filter
+        # shapes over live rows, so status- and goal-scoped listings hit
+        # an index range scan instead of re-filtering the user's history
+        Index(
+            "ix_tasks_user_status_active",
+            "user_id",
+            "status",
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        Index(
+            "ix_tasks_user_goal_active",
+            "user_id",
+            "goal_id",
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+        # The overwhelm sweep counts open high-importance tasks per user;
+        # restricting the index to unfinished live rows keeps it small
+        Index(
+            "ix_tasks_user_importance_open",
+            "user_id",
+            "importance_level",
+            postgresql_where=text(
+                "status != 'completed' AND deleted_at IS NULL"
+            )
+        ),
+        # Fallback for rebuilding users.active_task_count: counting a
+        # user's live active tasks stays index-only
+        Index(
+            "ix_tasks_user_active_count",
+            "user_id",
+            postgresql_where=text(
+                "status IN ('pending', 'in_progress') AND deleted_at IS NULL"
+            )
+        ),
+    )
+
     # Primary identification
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -46,10 +161,19 @@ class Task(Base, DatabaseMixin):
     importance_level = Column(Integer, default=5)  # 1-10
     urgency_level = Column(Integer, default=5)    # 1-10
     
-    # Task specifics
-    status = Column(String(20), default=TaskStatus.PENDING)
-    task_type = Column(String(20), default=TaskType.WORK)
-    complexity_level = Column(String(20), default=TaskComplexity.MEDIUM)
+    # Task specifics (native enums - stored by value to match API strings)
+    status = Column(
+        Enum(TaskStatus, name="task_status", values_callable=lambda e: [m.value for m in e]),
+        default=TaskStatus.PENDING
+    )
+    task_type = Column(
+        Enum(TaskType, name="task_type", values_callable=lambda e: [m.value for m in e]),
+        default=TaskType.WORK
+    )
+    complexity_level = Column(
+        Enum(TaskComplexity, name="task_complexity", values_callable=lambda e: [m.value for m in e]),
+        default=TaskComplexity.MEDIUM
+    )
     
     # Time management
     estimated_duration_minutes = Column(Integer, nullable=True)
@@ -60,8 +184,9 @@ class Task(Base, DatabaseMixin):
     
     # AI analysis
     ai_priority_score = Column(Float, nullable=True)  # AI-calculated priority
-    ai_suggestions = Column(JSON, nullable=True)     # AI recommendations
+    ai_suggestions = Column(JSONType, nullable=True) # AI recommendations (JSONB on PostgreSQL)
     ai_confidence = Column(Float, nullable=True)     # AI confidence in analysis
+    ai_input_hash = Column(String(32), nullable=True)  # md5 of the last analyzed context
     
     # ADHD-specific fields
     executive_difficulty = Column(Integer, default=5)  # 1-10, how hard to start/complete
@@ -70,25 +195,39 @@ class Task(Base, DatabaseMixin):
     required_energy_level = Column(Integer, default=5) # 1-10, energy needed
     
     # Context and environment
-    context_tags = Column(JSON, nullable=True)        # ["computer", "phone", "outdoors"]
+    context_tags = Column(JSONType, nullable=True)    # ["computer", "phone", "outdoors"] (JSONB on PostgreSQL)
     required_materials = Column(JSON, nullable=True)  # List of needed items
     optimal_environment = Column(JSON, nullable=True) # Environment preferences
     
     # Progress tracking
     progress_percentage = Column(Float, default=0.0)
+
+    # Generated column: the breakdown heuristic is computed by the DB at
+    # write time, so list endpoints can filter WHERE needs_breakdown
+    # without re-running Python branches per task
+    needs_breakdown = Column(
+        Boolean,
+        Computed(
+            "complexity_level = 'complex'"
+            " OR coalesce(estimated_duration_minutes, 0) > 45"
+            " OR executive_difficulty >= 7",
+            persisted=True
+        )
+    )
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
     
-    # Relationships
+    # Relationships - collections raise on implicit lazy SQL so N+1 loads
+    # have to be requested explicitly via selectinload()
     user = relationship("User", back_populates="tasks")
     goal = relationship("Goal", back_populates="tasks")
-    subtasks = relationship("Subtask", back_populates="task", cascade="all, delete-orphan")
-    time_blocks = relationship("TimeBlock", back_populates="task", cascade="all, delete-orphan")
+    subtasks = relationship("Subtask", back_populates="task", lazy="raise_on_sql", cascade="all, delete-orphan")
+    time_blocks = relationship("TimeBlock", back_populates="task", lazy="raise_on_sql", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Task(id={self.id}, title={self.title}, status={self.status})>"
@@ -97,76 +236,110 @@ class Task(Base, DatabaseMixin):
     def is_overdue(self) -> bool:
         """Check if task is overdue"""
         if self.due_date and self.status not in [TaskStatus.COMPLETED, TaskStatus.CANCELLED]:
-            return datetime.utcnow() > self.due_date
+            return now() > self.due_date
         return False
     
     @property
     def is_due_soon(self) -> bool:
         """Check if task is due within 24 hours"""
         if self.due_date and self.status not in [TaskStatus.COMPLETED, TaskStatus.CANCELLED]:
-            hours_until_due = (self.due_date - datetime.utcnow()).total_seconds() / 3600
+            hours_until_due = (self.due_date - now()).total_seconds() / 3600
             return 0 < hours_until_due <= 24
         return False
     
     @property
     def quadrant_name(self) -> str:
         """Get human-readable quadrant name"""
-        quadrant_names = {
-            1: "Urgent & Important",
-            2: "Not Urgent & Important", 
-            3: "Urgent & Not Important",
-            4: "Not Urgent & Not Important"
-        }
-        return quadrant_names.get(self.fc_quadrant, "Unassigned")
+        return _QUADRANT_NAMES.get(self.fc_quadrant, "Unassigned")
     
-    def calculate_priority_score(self) -> float:
-        """Calculate dynamic priority score based on multiple factors"""
-        base_score = (self.importance_level + self.urgency_level) / 2
-        
+    @staticmethod
+    def _priority_score(
+        importance_level,
+        urgency_level,
+        due_date,
+        complexity_level,
+        initiation_difficulty
+    ) -> float:
+        """Compute the priority score from its inputs"""
+        base_score = (importance_level + urgency_level) / 2
+
         # Adjust for due date
-        if self.due_date:
-            hours_until_due = (self.due_date - datetime.utcnow()).total_seconds() / 3600
+        if due_date:
+            hours_until_due = (due_date - now()).total_seconds() / 3600
             if hours_until_due < 24:
                 base_score += 2  # Boost for urgent deadlines
             elif hours_until_due < 168:  # One week
                 base_score += 1
-        
+
         # Adjust for complexity (simpler tasks get slight boost for momentum)
-        complexity_adjustments = {
-            TaskComplexity.MICRO: 0.5,
-            TaskComplexity.SIMPLE: 0.2,
-            TaskComplexity.MEDIUM: 0,
-            TaskComplexity.COMPLEX: -0.5
-        }
-        base_score += complexity_adjustments.get(self.complexity_level, 0)
-        
+        base_score += _COMPLEXITY_ADJUSTMENTS.get(complexity_level, 0)
+
         # Adjust for executive function difficulty (easier to start gets boost)
-        if self.initiation_difficulty <= 3:
+        if initiation_difficulty <= 3:
             base_score += 0.5
-        elif self.initiation_difficulty >= 8:
+        elif initiation_difficulty >= 8:
             base_score -= 0.5
-        
+
         return max(1.0, min(10.0, base_score))
+
+    def calculate_priority_score(self) -> float:
+        """Calculate dynamic priority score based on multiple factors"""
+        return self._priority_score(
+            self.importance_level,
+            self.urgency_level,
+            self.due_date,
+            self.complexity_level,
+            self.initiation_difficulty
+        )
+
+    @validates("importance_level", "urgency_level", "due_date", "complexity_level", "initiation_difficulty")
+    def _refresh_priority_score(self, key, value):
+        """Keep the persisted priority score in sync with its inputs.
+
+        Recomputing on write means list endpoints can sort on the stored
+        ai_priority_score column (index-backed) instead of re-running the
+        scoring function per task per request.
+        """
+        inputs = {
+            "importance_level": self.importance_level,
+            "urgency_level": self.urgency_level,
+            "due_date": self.due_date,
+            "complexity_level": self.complexity_level,
+            "initiation_difficulty": self.initiation_difficulty,
+        }
+        inputs[key] = value
+        # Skip until enough inputs are populated (e.g. mid-construction)
+        if None not in (
+            inputs["importance_level"],
+            inputs["urgency_level"],
+            inputs["initiation_difficulty"]
+        ):
+            self.ai_priority_score = self._priority_score(**inputs)
+        return value
     
     def start_task(self):
         """Mark task as started"""
         if self.status == TaskStatus.PENDING:
             self.status = TaskStatus.IN_PROGRESS
-            self.started_at = datetime.utcnow()
-            self.updated_at = datetime.utcnow()
+            self.started_at = now()
+            self.updated_at = now()
     
     def complete_task(self, actual_duration: int = None):
         """Mark task as completed"""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = now()
         self.progress_percentage = 100.0
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
         
         if actual_duration:
             self.actual_duration_minutes = actual_duration
     
     def get_breakdown_recommendation(self) -> bool:
         """Check if task should be broken down into subtasks"""
+        # The DB computes this in the generated needs_breakdown column;
+        # fall back to the Python heuristic for unflushed instances
+        if self.needs_breakdown is not None:
+            return bool(self.needs_breakdown)
         if self.complexity_level in [TaskComplexity.COMPLEX]:
             return True
         if self.estimated_duration_minutes and self.estimated_duration_minutes > 45:
@@ -187,7 +360,70 @@ class Task(Base, DatabaseMixin):
             self.ai_suggestions = {}
         
         self.ai_suggestions[key] = value
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now()
+
+# The counter events below need the pre-update status/deleted_at even
+# when the attribute is expired; active_history loads the old value on
+# assignment instead of leaving the history one-sided
+@event.listens_for(Task, "mapper_configured")
+def _enable_counter_history(mapper, cls):
+    cls.status.impl.active_history = True
+    cls.deleted_at.impl.active_history = True
+
+
+# Lightweight table handle so the counter UPDATE avoids importing the
+# User model (users.py does not import tasks, keep it that way)
+_users_table = table("users", column("id"), column("active_task_count"))
+
+_ACTIVE_STATUSES = (TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value)
+
+
+def _is_active(status, deleted_at) -> bool:
+    """Whether a (status, deleted_at) pair counts toward active tasks"""
+    value = status.value if isinstance(status, TaskStatus) else status
+    return deleted_at is None and value in _ACTIVE_STATUSES
+
+
+def _bump_active_count(connection, user_id, delta: int):
+    connection.execute(
+        update(_users_table)
+        .where(_users_table.c.id == user_id)
+        .values(active_task_count=_users_table.c.active_task_count + delta)
+    )
+
+
+@event.listens_for(Task, "after_insert")
+def _task_count_on_insert(mapper, connection, target):
+    if _is_active(target.status, target.deleted_at):
+        _bump_active_count(connection, target.user_id, 1)
+
+
+@event.listens_for(Task, "after_delete")
+def _task_count_on_delete(mapper, connection, target):
+    if _is_active(target.status, target.deleted_at):
+        _bump_active_count(connection, target.user_id, -1)
+
+
+@event.listens_for(Task, "after_update")
+def _task_count_on_update(mapper, connection, target):
+    """Keep users.active_task_count in step with status transitions.
+
+    Runs inside the flush, so the attribute history still holds the
+    pre-update status and deleted_at; the counter only moves when the
+    row crosses the active-set boundary (including soft deletes).
+    """
+    status_history = get_history(target, "status")
+    deleted_history = get_history(target, "deleted_at")
+
+    old_status = status_history.deleted[0] if status_history.deleted else target.status
+    old_deleted = deleted_history.deleted[0] if deleted_history.deleted else target.deleted_at
+
+    was_active = _is_active(old_status, old_deleted)
+    is_active = _is_active(target.status, target.deleted_at)
+
+    if was_active != is_active:
+        _bump_active_count(connection, target.user_id, 1 if is_active else -1)
+
 
 class TimeBlock(Base, DatabaseMixin):
     """Time blocks for calendar integration"""
@@ -211,8 +447,8 @@ class TimeBlock(Base, DatabaseMixin):
     energy_match_score = Column(Float, nullable=True)  # How well this matches user's energy
     distraction_risk = Column(String(20), default="medium")  # low, medium, high
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     
     # Relationships
     task = relationship("Task", back_populates="time_blocks")
@@ -1,11 +1,13 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Float, JSON, Text, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Float, JSON, Text, Enum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from functools import cached_property
 import uuid
 import enum
 
-from ..database import Base, DatabaseMixin
+from ..database import Base, DatabaseMixin, JSONType
+from ..utils.time import now
 
 class AuthProvider(str, enum.Enum):
     EMAIL = "email"
@@ -17,9 +19,34 @@ class SubscriptionTier(str, enum.Enum):
     PREMIUM = "premium"
     ENTERPRISE = "enterprise"
 
+def _compute_peak_focus_mask(peak_hours) -> int:
+    """Build a 24-bit mask from [{"start": "09:00", "end": "11:00"}, ...].
+
+    Parsed once on profile write; is_peak_focus_time then reduces to a
+    single bit test instead of string splitting per call.
+    """
+    mask = 0
+    for period in peak_hours or []:
+        start_hour = int(period.get("start", "09:00").split(":")[0])
+        end_hour = int(period.get("end", "11:00").split(":")[0])
+        for hour in range(start_hour, end_hour + 1):
+            if 0 <= hour <= 23:
+                mask |= 1 << hour
+    return mask
+
 class User(Base, DatabaseMixin):
     __tablename__ = "users"
-    
+    __table_args__ = (
+        # GIN index so adhd_profile containment (@>) lookups stay indexable
+        # as server-side preference filtering grows
+        Index(
+            "ix_users_adhd_profile",
+            "adhd_profile",
+            postgresql_using="gin",
+            postgresql_ops={"adhd_profile": "jsonb_path_ops"}
+        ),
+    )
+
     # Primary identification
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -48,40 +75,63 @@ class User(Base, DatabaseMixin):
     privacy_focused = Column(Boolean, default=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=now)
     deleted_at = Column(DateTime, nullable=True)
     last_login_at = Column(DateTime, nullable=True)
     
-    # ADHD Profile - stored as JSON for flexibility
-    adhd_profile = Column(JSON, nullable=True)
-    
-    # Relationships
-    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
-    tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan")
-    ai_sessions = relationship("AISession", back_populates="user", cascade="all, delete-orphan")
-    integrations = relationship("Integration", back_populates="user", cascade="all, delete-orphan")
+    # ADHD Profile - stored as JSON for flexibility (JSONB on PostgreSQL)
+    adhd_profile = Column(JSONType, nullable=True)
+
+    # 24-bit mask of peak focus hours, precomputed when the profile is
+    # written so per-hour checks avoid re-parsing "HH:MM" strings
+    peak_focus_mask = Column(Integer, default=0)
+
+    # Denormalized count of live pending/in-progress tasks, maintained by
+    # flush events on Task so overwhelm checks read one column instead of
+    # running COUNT(*) over the user's task history
+    active_task_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Relationships - these collections grow without bound, so implicit
+    # lazy loads raise and callers must opt in with selectinload()
+    goals = relationship("Goal", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    tasks = relationship("Task", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    ai_sessions = relationship("AISession", back_populates="user", lazy="raise", cascade="all, delete-orphan")
+    integrations = relationship("Integration", back_populates="user", lazy="raise", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
     
-    @property
+    @cached_property
     def full_name(self):
+        # Cached per instance - ORM objects live for one request, so the
+        # string is built once instead of on every access
         return f"{self.first_name} {self.last_name}"
     
+    @cached_property
+    def _adhd(self) -> dict:
+        # Cached view of the profile dict - preference reads happen many
+        # times per request while the profile itself rarely changes
+        return self.adhd_profile or {}
+
     def get_adhd_preference(self, key: str, default=None):
         """Get ADHD profile preference by key"""
-        if self.adhd_profile:
-            return self.adhd_profile.get(key, default)
-        return default
-    
+        return self._adhd.get(key, default)
+
     def update_adhd_profile(self, updates: dict):
         """Update ADHD profile with new values"""
         if self.adhd_profile is None:
             self.adhd_profile = {}
-        
+
         self.adhd_profile.update(updates)
-        self.updated_at = datetime.utcnow()
+        # Drop the cached view so subsequent reads see the new values
+        self.__dict__.pop('_adhd', None)
+
+        # Keep the precomputed hour mask in sync with the profile
+        if "peak_focus_hours" in updates:
+            self.peak_focus_mask = _compute_peak_focus_mask(updates["peak_focus_hours"])
+
+        self.updated_at = now()
     
     def get_overwhelm_threshold(self) -> int:
         """Get user's overwhelm threshold (1-10 scale)"""
@@ -101,10 +151,9 @@ class User(Base, DatabaseMixin):
     
     def is_peak_focus_time(self, hour: int) -> bool:
         """Check if given hour is within user's peak focus time"""
-        peak_hours = self.get_adhd_preference("peak_focus_hours", [])
-        for period in peak_hours:
-            start_hour = int(period.get("start", "09:00").split(":")[0])
-            end_hour = int(period.get("end", "11:00").split(":")[0])
-            if start_hour <= hour <= end_hour:
-                return True
-        return False
\ No newline at end of file
+        mask = self.peak_focus_mask
+        if mask is None:
+            # Profile written before the mask column existed
+            mask = _compute_peak_focus_mask(self.get_adhd_preference("peak_focus_hours", []))
+            self.peak_focus_mask = mask
+        return bool(mask & (1 << hour))
\ No newline at end of file
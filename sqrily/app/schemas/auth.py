@@ -1,13 +1,24 @@
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints
+from typing import Optional, List, Dict, Any, Annotated
 from datetime import datetime
+from uuid import UUID
+
+from ..models.user import AuthProvider, SubscriptionTier
+
+# Name fields: trimmed, non-empty. Declared once so the constraint is
+# compiled into pydantic-core instead of running a Python validator per field.
+TrimmedName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+# Shared password constraint - one compiled pydantic-core schema reused by
+# every model that accepts a password
+Password = Annotated[str, Field(min_length=8)]
 
 class ADHDProfile(BaseModel):
     """ADHD-specific profile settings"""
     executive_strengths: Optional[List[str]] = None
     executive_challenges: Optional[List[str]] = None
-    overwhelm_threshold: Optional[int] = 6  # 1-10 scale
-    hyperfocus_tendency: Optional[int] = 5  # 1-10 scale
+    overwhelm_threshold: Optional[Annotated[int, Field(ge=1, le=10)]] = 6  # 1-10 scale
+    hyperfocus_tendency: Optional[Annotated[int, Field(ge=1, le=10)]] = 5  # 1-10 scale
     peak_focus_hours: Optional[List[Dict[str, Any]]] = None
     energy_pattern: Optional[str] = "morning"  # morning, afternoon, evening, variable
     attention_span_minutes: Optional[int] = 25
@@ -19,20 +30,6 @@ class ADHDProfile(BaseModel):
     feedback_sensitivity: Optional[int] = 5  # 1-10 scale
     optimal_environment: Optional[Dict[str, str]] = None
     distraction_triggers: Optional[List[str]] = None
-    
-    @field_validator('overwhelm_threshold')
-    @classmethod
-    def validate_overwhelm_threshold(cls, v):
-        if v and (v < 1 or v > 10):
-            raise ValueError('Overwhelm threshold must be between 1 and 10')
-        return v
-
-    @field_validator('hyperfocus_tendency')
-    @classmethod
-    def validate_hyperfocus_tendency(cls, v):
-        if v and (v < 1 or v > 10):
-            raise ValueError('Hyperfocus tendency must be between 1 and 10')
-        return v
 
 class DeviceInfo(BaseModel):
     """Device information for login tracking"""
@@ -43,25 +40,11 @@ class DeviceInfo(BaseModel):
 class UserRegister(BaseModel):
     """User registration request"""
     email: EmailStr
-    password: str
-    first_name: str
-    last_name: str
+    password: Password
+    first_name: TrimmedName
+    last_name: TrimmedName
     timezone: str = "UTC"
     adhd_profile: Optional[ADHDProfile] = None
-    
-    @field_validator('password')
-    @classmethod
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
-
-    @field_validator('first_name', 'last_name')
-    @classmethod
-    def validate_names(cls, v):
-        if len(v.strip()) < 1:
-            raise ValueError('Name cannot be empty')
-        return v.strip()
 
 class UserLogin(BaseModel):
     """User login request"""
@@ -72,19 +55,20 @@ class UserLogin(BaseModel):
 
 class UserResponse(BaseModel):
     """User information in responses"""
-    id: str
+    # UUID and enum types serialize directly in pydantic-core - no str()
+    # casts in the route handlers
+    id: UUID
     email: str
     first_name: str
     last_name: str
     avatar_url: Optional[str] = None
-    provider: str
+    provider: AuthProvider
     onboarding_completed: bool
-    subscription_tier: str
+    subscription_tier: SubscriptionTier
     adhd_preferences: Optional[Dict[str, Any]] = None
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 class TokenResponse(BaseModel):
     """Token response for authentication"""
@@ -127,23 +111,9 @@ class PasswordResetRequest(BaseModel):
 class PasswordResetConfirm(BaseModel):
     """Password reset confirmation"""
     token: str
-    new_password: str
-    
-    @field_validator('new_password')
-    @classmethod
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    new_password: Password
 
 class ChangePasswordRequest(BaseModel):
     """Change password request"""
     current_password: str
-    new_password: str
-    
-    @field_validator('new_password')
-    @classmethod
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
\ No newline at end of file
+    new_password: Password
\ No newline at end of file
@@ -8,7 +8,7 @@ Sqrily methodology integration and ADHD-specific features.
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator
+from pydantic import ConfigDict, BaseModel, Field, TypeAdapter, field_validator
 from enum import Enum
 
 from ..models.goal import GoalStatus
@@ -167,8 +167,7 @@ class GoalResponse(GoalBase):
     completed_task_count: Optional[int] = Field(None, description="Number of completed tasks")
     milestone_count: Optional[int] = Field(None, description="Number of milestones")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class GoalListResponse(BaseModel):
@@ -179,6 +178,7 @@ class GoalListResponse(BaseModel):
     per_page: int = Field(..., description="Items per page")
     has_next: bool = Field(..., description="Whether there are more pages")
     has_prev: bool = Field(..., description="Whether there are previous pages")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page")
 
 
 class GoalFilters(BaseModel):
@@ -240,8 +240,7 @@ class MilestoneResponse(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class GoalAnalysisRequest(BaseModel):
@@ -265,8 +264,29 @@ class GoalAnalysisResponse(BaseModel):
     confidence_score: float = Field(..., description="AI confidence in the analysis")
 
 
+class GoalTaskSummary(BaseModel):
+    """Lightweight task view returned by the goal tasks endpoint"""
+    id: UUID = Field(..., description="Task ID")
+    title: str = Field(..., description="Task title")
+    description: Optional[str] = Field(None, description="Task description")
+    status: str = Field(..., description="Current task status")
+    complexity_level: Optional[str] = Field(None, description="Task complexity level")
+    progress_percentage: float = Field(0.0, description="Progress percentage")
+    due_date: Optional[datetime] = Field(None, description="Due date")
+    created_at: datetime = Field(..., description="Creation timestamp")
+    is_overdue: bool = Field(False, description="Whether task is overdue")
+
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+
 class GoalProgressUpdate(BaseModel):
     """Schema for updating goal progress"""
     progress_percentage: float = Field(..., ge=0.0, le=100.0, description="Progress percentage")
     notes: Optional[str] = Field(None, max_length=500, description="Progress notes")
     milestone_completed: Optional[UUID] = Field(None, description="Milestone ID if one was completed")
+
+
+# Module-level adapter, built once - pydantic-core validates whole ORM
+# result lists in a single Rust-side pass
+MILESTONE_LIST_ADAPTER = TypeAdapter(List[MilestoneResponse])
+GOAL_TASK_LIST_ADAPTER = TypeAdapter(List[GoalTaskSummary])
@@ -5,11 +5,12 @@ This module contains Pydantic models for subtask CRUD operations,
 including ADHD-specific features and AI-generated subtasks.
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import ConfigDict, BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from uuid import UUID
 from enum import Enum
+from functools import cached_property
+from uuid import UUID
 
 
 class SubtaskTypeEnum(str, Enum):
@@ -153,8 +154,7 @@ class SubtaskResponse(SubtaskBase):
     is_blocked: Optional[bool] = Field(None, description="Whether subtask is blocked by dependencies")
     can_start: Optional[bool] = Field(None, description="Whether subtask can be started now")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class SubtaskListResponse(BaseModel):
@@ -182,3 +182,17 @@ class SubtaskFilters(BaseModel):
     difficulty_level: Optional[List[SubtaskDifficultyEnum]] = Field(None, description="Filter by difficulty")
     ai_generated: Optional[bool] = Field(None, description="Filter by AI generation")
     can_start_now: Optional[bool] = Field(None, description="Filter by availability to start")
+
+    # Cached .value projections so query building binds plain strings
+    # without rebuilding a list per request
+    @cached_property
+    def status_values(self) -> Optional[List[str]]:
+        return [s.value for s in self.status] if self.status else None
+
+    @cached_property
+    def subtask_type_values(self) -> Optional[List[str]]:
+        return [t.value for t in self.subtask_type] if self.subtask_type else None
+
+    @cached_property
+    def difficulty_level_values(self) -> Optional[List[str]]:
+        return [d.value for d in self.difficulty_level] if self.difficulty_level else None
@@ -6,44 +6,49 @@ ADHD-specific fields and validation.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Annotated, Literal, Union
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator
-from enum import Enum
+from pydantic import ConfigDict, BaseModel, Field, StringConstraints, TypeAdapter, computed_field, field_validator, model_validator
 
-from ..models.task import TaskStatus, TaskComplexity, TaskType
+from ..utils.time import now
 
 
-class TaskStatusEnum(str, Enum):
-    """Task status enumeration for API"""
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled"
-    BLOCKED = "blocked"
+# Literal aliases for the API layer - pydantic-core validates these with
+# its fast literal path instead of Enum member coercion. The ORM keeps the
+# real enum classes in models.task.
+TaskStatusLiteral = Literal["pending", "in_progress", "completed", "cancelled", "blocked"]
+TaskComplexityLiteral = Literal["micro", "simple", "medium", "complex"]
+TaskTypeLiteral = Literal["work", "personal", "health", "learning", "admin", "creative"]
 
+# Context tags normalize (strip + lowercase) inside pydantic-core's string
+# validator; the list cap is enforced there too
+TagStr = Annotated[str, StringConstraints(strip_whitespace=True, to_lower=True, min_length=1)]
+ContextTags = Annotated[List[TagStr], Field(max_length=10)]
 
-class TaskComplexityEnum(str, Enum):
-    """Task complexity enumeration for API"""
-    MICRO = "micro"      # 2-5 minutes
-    SIMPLE = "simple"    # 5-15 minutes
-    MEDIUM = "medium"    # 15-45 minutes
-    COMPLEX = "complex"  # 45+ minutes
+# Mirrors the quadrant naming in models.task for serialization
+_QUADRANT_NAMES = {
+    1: "Urgent & Important",
+    2: "Not Urgent & Important",
+    3: "Urgent & Not Important",
+    4: "Not Urgent & Not Important"
+}
 
 
-class TaskTypeEnum(str, Enum):
-    """Task type enumeration for API"""
-    WORK = "work"
-    PERSONAL = "personal"
-    HEALTH = "health"
-    LEARNING = "learning"
-    ADMIN = "admin"
-    CREATIVE = "creative"
+@lru_cache(maxsize=4096)
+def _norm_tag(tag: str) -> str:
+    """Normalize a filter tag, memoized across requests.
+
+    The tag vocabulary is small and repeats heavily ("computer", "phone",
+    ...), so caching strip+lower returns the same interned string for
+    repeated filters instead of allocating a fresh copy per request.
+    """
+    return tag.strip().lower()
 
 
 class TaskBase(BaseModel):
     """Base task schema with common fields"""
-    title: str = Field(..., min_length=1, max_length=255, description="Task title")
+    title: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=255)] = Field(..., description="Task title")
     description: Optional[str] = Field(None, max_length=2000, description="Task description")
     
     # Sqrily classification
@@ -51,8 +56,8 @@ class TaskBase(BaseModel):
     urgency_level: int = Field(5, ge=1, le=10, description="Urgency level (1-10)")
     
     # Task specifics
-    task_type: TaskTypeEnum = Field(TaskTypeEnum.WORK, description="Type of task")
-    complexity_level: TaskComplexityEnum = Field(TaskComplexityEnum.MEDIUM, description="Task complexity")
+    task_type: TaskTypeLiteral = Field("work", description="Type of task")
+    complexity_level: TaskComplexityLiteral = Field("medium", description="Task complexity")
     
     # Time management
     estimated_duration_minutes: Optional[int] = Field(None, ge=1, le=480, description="Estimated duration in minutes")
@@ -65,34 +70,10 @@ class TaskBase(BaseModel):
     required_energy_level: int = Field(5, ge=1, le=10, description="Energy needed (1-10)")
     
     # Context and environment
-    context_tags: Optional[List[str]] = Field(None, description="Context tags like 'computer', 'phone', 'outdoors'")
+    context_tags: Optional[ContextTags] = Field(None, description="Context tags like 'computer', 'phone', 'outdoors'")
     required_materials: Optional[List[str]] = Field(None, description="List of needed items")
     optimal_environment: Optional[Dict[str, Any]] = Field(None, description="Environment preferences")
 
-    @field_validator('title')
-    @classmethod
-    def validate_title(cls, v):
-        """Validate and clean task title"""
-        if not v or not v.strip():
-            raise ValueError('Task title cannot be empty')
-        return v.strip()
-
-    @field_validator('context_tags')
-    @classmethod
-    def validate_context_tags(cls, v):
-        """Validate context tags"""
-        if v is not None:
-            # Limit number of tags
-            if len(v) > 10:
-                raise ValueError('Maximum 10 context tags allowed')
-            # Clean and validate each tag
-            cleaned_tags = []
-            for tag in v:
-                if isinstance(tag, str) and tag.strip():
-                    cleaned_tags.append(tag.strip().lower())
-            return cleaned_tags
-        return v
-
 
 class TaskCreate(TaskBase):
     """Schema for creating a new task"""
@@ -103,20 +84,21 @@ class TaskCreate(TaskBase):
     scheduled_start: Optional[datetime] = Field(None, description="Scheduled start time")
     scheduled_end: Optional[datetime] = Field(None, description="Scheduled end time")
 
-    @field_validator('scheduled_end')
-    @classmethod
-    def validate_scheduled_times(cls, v, info):
+    @model_validator(mode="after")
+    def validate_scheduled_times(self) -> "TaskCreate":
         """Validate that end time is after start time"""
-        if v is not None and 'scheduled_start' in info.data:
-            scheduled_start = info.data['scheduled_start']
-            if scheduled_start is not None and v <= scheduled_start:
-                raise ValueError('Scheduled end time must be after start time')
-        return v
+        if (
+            self.scheduled_start is not None
+            and self.scheduled_end is not None
+            and self.scheduled_end <= self.scheduled_start
+        ):
+            raise ValueError('Scheduled end time must be after start time')
+        return self
 
 
 class TaskUpdate(BaseModel):
     """Schema for updating an existing task"""
-    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    title: Optional[Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=255)]] = None
     description: Optional[str] = Field(None, max_length=2000)
     
     # Sqrily classification
@@ -124,9 +106,9 @@ class TaskUpdate(BaseModel):
     urgency_level: Optional[int] = Field(None, ge=1, le=10)
     
     # Task specifics
-    status: Optional[TaskStatusEnum] = None
-    task_type: Optional[TaskTypeEnum] = None
-    complexity_level: Optional[TaskComplexityEnum] = None
+    status: Optional[TaskStatusLiteral] = None
+    task_type: Optional[TaskTypeLiteral] = None
+    complexity_level: Optional[TaskComplexityLiteral] = None
     
     # Time management
     estimated_duration_minutes: Optional[int] = Field(None, ge=1, le=480)
@@ -141,23 +123,13 @@ class TaskUpdate(BaseModel):
     required_energy_level: Optional[int] = Field(None, ge=1, le=10)
     
     # Context and environment
-    context_tags: Optional[List[str]] = None
+    context_tags: Optional[ContextTags] = None
     required_materials: Optional[List[str]] = None
     optimal_environment: Optional[Dict[str, Any]] = None
     
     # Progress
     progress_percentage: Optional[float] = Field(None, ge=0.0, le=100.0)
 
-    @field_validator('title')
-    @classmethod
-    def validate_title(cls, v):
-        """Validate and clean task title"""
-        if v is not None:
-            if not v.strip():
-                raise ValueError('Task title cannot be empty')
-            return v.strip()
-        return v
-
 
 class TaskResponse(TaskBase):
     """Schema for task responses"""
@@ -166,16 +138,17 @@ class TaskResponse(TaskBase):
     goal_id: Optional[UUID] = Field(None, description="Associated goal ID")
     
     # Status and progress
-    status: TaskStatusEnum = Field(..., description="Current task status")
+    status: TaskStatusLiteral = Field(..., description="Current task status")
     progress_percentage: float = Field(0.0, description="Progress percentage")
     
     # Sqrily quadrant (calculated)
     fc_quadrant: Optional[int] = Field(None, description="Franklin Covey quadrant (1-4)")
-    quadrant_name: Optional[str] = Field(None, description="Human-readable quadrant name")
     
     # AI analysis
     ai_priority_score: Optional[float] = Field(None, description="AI-calculated priority score")
-    ai_suggestions: Optional[Dict[str, Any]] = Field(None, description="AI recommendations")
+    # Server-produced opaque payload - Any skips per-key revalidation of
+    # data we just read from our own database
+    ai_suggestions: Optional[Any] = Field(None, description="AI recommendations")
     ai_confidence: Optional[float] = Field(None, description="AI confidence in analysis")
     
     # Time tracking
@@ -189,13 +162,33 @@ class TaskResponse(TaskBase):
     started_at: Optional[datetime] = Field(None, description="When task was started")
     completed_at: Optional[datetime] = Field(None, description="When task was completed")
     
-    # Computed properties
-    is_overdue: Optional[bool] = Field(None, description="Whether task is overdue")
-    is_due_soon: Optional[bool] = Field(None, description="Whether task is due within 24 hours")
     breakdown_recommended: Optional[bool] = Field(None, description="Whether task should be broken down")
 
-    class Config:
-        from_attributes = True
+    # Read-only DTO: frozen lets pydantic-core skip per-setattr validation
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    # Derived flags are computed fields: pydantic-core skips them entirely
+    # on the validation path and reads the property once per model_dump(),
+    # so paginated responses save three validator entries per task
+    @computed_field(description="Human-readable quadrant name")  # type: ignore[prop-decorator]
+    @property
+    def quadrant_name(self) -> str:
+        return _QUADRANT_NAMES.get(self.fc_quadrant, "Unassigned")
+
+    @computed_field(description="Whether task is overdue")  # type: ignore[prop-decorator]
+    @property
+    def is_overdue(self) -> bool:
+        if self.due_date and self.status not in ("completed", "cancelled"):
+            return now() > self.due_date
+        return False
+
+    @computed_field(description="Whether task is due within 24 hours")  # type: ignore[prop-decorator]
+    @property
+    def is_due_soon(self) -> bool:
+        if self.due_date and self.status not in ("completed", "cancelled"):
+            hours_until_due = (self.due_date - now()).total_seconds() / 3600
+            return 0 < hours_until_due <= 24
+        return False
 
 
 class TaskListResponse(BaseModel):
@@ -206,13 +199,14 @@ class TaskListResponse(BaseModel):
     per_page: int = Field(..., description="Items per page")
     has_next: bool = Field(..., description="Whether there are more pages")
     has_prev: bool = Field(..., description="Whether there are previous pages")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page")
 
 
 class TaskFilters(BaseModel):
     """Schema for task filtering parameters"""
-    status: Optional[List[TaskStatusEnum]] = Field(None, description="Filter by status")
-    task_type: Optional[List[TaskTypeEnum]] = Field(None, description="Filter by type")
-    complexity_level: Optional[List[TaskComplexityEnum]] = Field(None, description="Filter by complexity")
+    status: Optional[List[TaskStatusLiteral]] = Field(None, description="Filter by status")
+    task_type: Optional[List[TaskTypeLiteral]] = Field(None, description="Filter by type")
+    complexity_level: Optional[List[TaskComplexityLiteral]] = Field(None, description="Filter by complexity")
     fc_quadrant: Optional[List[int]] = Field(None, description="Filter by Sqrily quadrant")
     goal_id: Optional[UUID] = Field(None, description="Filter by goal")
     due_before: Optional[datetime] = Field(None, description="Due before this date")
@@ -221,14 +215,36 @@ class TaskFilters(BaseModel):
     min_priority: Optional[float] = Field(None, ge=1.0, le=10.0, description="Minimum priority score")
     max_priority: Optional[float] = Field(None, ge=1.0, le=10.0, description="Maximum priority score")
 
+    @field_validator('context_tags')
+    @classmethod
+    def normalize_tags(cls, v):
+        """Normalize filter tags through the memoized helper"""
+        if v is not None:
+            return [_norm_tag(tag) for tag in v]
+        return v
+
+
+class StartTaskAction(BaseModel):
+    """Schema for starting a task"""
+    action: Literal["start"] = "start"
+    notes: Optional[str] = Field(None, max_length=500, description="Optional notes")
+
 
-class TaskActionRequest(BaseModel):
-    """Schema for task actions like start, complete, etc."""
-    action: str = Field(..., description="Action to perform")
+class CompleteTaskAction(BaseModel):
+    """Schema for completing a task"""
+    action: Literal["complete"] = "complete"
     notes: Optional[str] = Field(None, max_length=500, description="Optional notes")
     actual_duration_minutes: Optional[int] = Field(None, ge=1, description="Actual duration for completion")
 
 
+# Discriminated union: pydantic-core jumps straight to the right variant
+# by the action tag instead of trying each shape in turn
+TaskActionRequest = Annotated[
+    Union[StartTaskAction, CompleteTaskAction],
+    Field(discriminator="action")
+]
+
+
 class TaskBreakdownRequest(BaseModel):
     """Schema for requesting AI task breakdown"""
     max_subtasks: int = Field(5, ge=2, le=10, description="Maximum number of subtasks to create")
@@ -240,7 +256,36 @@ class TaskBreakdownRequest(BaseModel):
 class TaskBreakdownResponse(BaseModel):
     """Schema for AI task breakdown response"""
     original_task_id: UUID = Field(..., description="Original task ID")
-    subtasks: List[Dict[str, Any]] = Field(..., description="Generated subtasks")
+    # Free-form AI output; items are passed through, not revalidated
+    subtasks: List[Any] = Field(..., description="Generated subtasks")
     ai_reasoning: str = Field(..., description="AI explanation of the breakdown")
     confidence_score: float = Field(..., description="AI confidence in the breakdown")
     estimated_total_time: int = Field(..., description="Total estimated time for all subtasks")
+
+
+# Module-level adapters - built once at import. Manual validation or
+# serialization paths (background jobs, webhooks, cached payloads) must
+# reuse these; constructing a TypeAdapter inside a function rebuilds the
+# compiled validator on every call.
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponse])
+TASK_FILTERS_ADAPTER = TypeAdapter(TaskFilters)
+
+
+@lru_cache(maxsize=1024)
+def _cached_filters(items: frozenset) -> TaskFilters:
+    return TASK_FILTERS_ADAPTER.validate_python(dict(items))
+
+
+def parse_task_filters(params: Dict[str, Any]) -> TaskFilters:
+    """Build TaskFilters from query params, caching by filter shape.
+
+    Paginated clients repeat the same filter set while only the page
+    changes; caching on the (hashable) param items returns the
+    already-validated TaskFilters instead of re-running validation.
+    """
+    items = frozenset(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in params.items()
+        if value is not None
+    )
+    return _cached_filters(items)
@@ -5,23 +5,20 @@ This module contains Pydantic models for user profile management,
 ADHD preferences, and user-related API requests/responses.
 """
 
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, Dict, Any, List
+from pydantic import ConfigDict, BaseModel, EmailStr, StringConstraints, TypeAdapter, field_validator
+from typing import Optional, Dict, Any, List, Annotated
 from datetime import datetime
 
+# Trimmed, non-empty names - the constraint runs inside pydantic-core
+# instead of a Python field_validator
+TrimmedName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
 class UserUpdate(BaseModel):
     """User profile update request"""
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
+    first_name: Optional[TrimmedName] = None
+    last_name: Optional[TrimmedName] = None
     timezone: Optional[str] = None
     avatar_url: Optional[str] = None
-    
-    @field_validator('first_name', 'last_name')
-    @classmethod
-    def validate_names(cls, v):
-        if v is not None and len(v.strip()) < 1:
-            raise ValueError('Name cannot be empty')
-        return v.strip() if v else v
 
 class ADHDProfileUpdate(BaseModel):
     """ADHD profile update request"""
@@ -101,6 +98,8 @@ class OnboardingStep(BaseModel):
 
 class UserStats(BaseModel):
     """User statistics and metrics"""
+    model_config = ConfigDict(frozen=True)
+
     total_tasks: int
     completed_tasks: int
     completion_rate: float
@@ -141,8 +140,10 @@ class UserProfileResponse(BaseModel):
     created_at: datetime
     last_login_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    # Read-only DTO: frozen skips setattr guards; defer_build postpones
+    # validator construction to first use so non-HTTP workers that import
+    # the schemas don't pay for it
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=True)
 
 class UserListItem(BaseModel):
     """User item for admin list views"""
@@ -157,8 +158,7 @@ class UserListItem(BaseModel):
     created_at: datetime
     last_login_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=True)
 
 class UserSearchFilters(BaseModel):
     """Filters for user search (admin only)"""
@@ -192,3 +192,8 @@ class AccountDeactivationRequest(BaseModel):
     password: str
     reason: Optional[str] = None
     feedback: Optional[str] = None
+
+# Warm the EmailStr validator at import time - email-validator does its
+# expensive setup on first use, and this moves that cost from the first
+# live request to worker startup
+_EMAIL_ADAPTER = TypeAdapter(EmailStr)
@@ -0,0 +1,96 @@
+"""
+Redis-backed response cache for OpenAI calls.
+
+Many users create near-identical tasks ("do laundry", "answer email"),
+so the same prompt is paid for over and over. Completed responses are
+cached for a week keyed on a hash of everything that shapes the output
+(model, messages, temperature, max_tokens); a hit skips the API call
+entirely, which is the dominant cost of the AI tasks.
+
+Redis being down never blocks an AI call - every cache operation
+degrades to a miss.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import orjson
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+# One week - analysis for an unchanged prompt does not go stale faster
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+_KEY_PREFIX = "ai:response:"
+
+_client = None
+_unavailable = False
+
+
+def _redis():
+    """Lazily build one Redis client, remembering a failed connect."""
+    global _client, _unavailable
+
+    if _unavailable:
+        return None
+
+    if _client is None:
+        try:
+            import redis
+            _client = redis.Redis.from_url(
+                settings.redis_url,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        except Exception as e:
+            logger.warning("AI cache unavailable", error=str(e))
+            _unavailable = True
+            return None
+
+    return _client
+
+
+def response_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+) -> str:
+    """Hash every input that shapes the completion into one cache key."""
+    payload = orjson.dumps({
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    })
+    return _KEY_PREFIX + hashlib.sha256(payload).hexdigest()
+
+
+def get_response(key: str) -> Optional[str]:
+    """Return the cached completion text, or None on miss/error."""
+    client = _redis()
+    if client is None:
+        return None
+
+    try:
+        cached = client.get(key)
+    except Exception as e:
+        logger.warning("AI cache read failed", error=str(e))
+        return None
+
+    return cached.decode("utf-8") if cached is not None else None
+
+
+def store_response(key: str, content: str) -> None:
+    """Store a completion with the standard TTL; errors are swallowed."""
+    client = _redis()
+    if client is None:
+        return
+
+    try:
+        client.setex(key, CACHE_TTL_SECONDS, content.encode("utf-8"))
+    except Exception as e:
+        logger.warning("AI cache write failed", error=str(e))
@@ -5,20 +5,35 @@ This service handles all interactions with OpenAI's GPT models,
 providing ADHD-specific prompts and response processing.
 """
 
+import threading
+
 import openai
 from openai import OpenAI
 import tiktoken
 from tenacity import retry, stop_after_attempt, wait_exponential
 from typing import Dict, List, Optional, Any, Tuple
 import structlog
-import json
+import orjson
 from datetime import datetime
 
 from ..config import settings
 from ..models import User, Task, Goal, AISession
+from . import ai_cache
 
 logger = structlog.get_logger()
 
+# Global cap on in-flight OpenAI calls. Without it a burst of requests
+# all hit the API at once, trip the rate limiter and stall in
+# exponential backoff; bounding concurrency keeps throughput steady.
+# A threading.Semaphore guards the synchronous client call correctly in
+# every runtime this service sees: FastAPI threadpool threads, and the
+# gevent worker where each Celery task spins up its own short-lived
+# asyncio loop (an asyncio.Semaphore shared across those loops is both
+# ineffective and unsafe - gevent's monkey-patching makes a cross-loop
+# release trip the loop's thread-identity check). Under gevent the
+# acquire is cooperative, so blocked greenlets yield to the hub.
+_openai_semaphore = threading.Semaphore(settings.openai_max_concurrency)
+
 class OpenAIService:
     """Service for OpenAI API interactions with ADHD-specific optimizations"""
     
@@ -58,15 +73,29 @@ class OpenAIService:
         max_tokens: Optional[int] = None
     ) -> Tuple[str, int, int]:
         """Make API call to OpenAI with retry logic"""
-        
+
+        # Identical prompts resolve from the response cache - no tokens
+        # are spent, so usage is reported as zero
+        cache_key = ai_cache.response_key(
+            self.model, messages, temperature or self.temperature,
+            max_tokens or self.max_tokens
+        )
+        cached = ai_cache.get_response(cache_key)
+        if cached is not None:
+            logger.info("OpenAI response served from cache", model=self.model)
+            return cached, 0, 0
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature or self.temperature,
-                max_tokens=max_tokens or self.max_tokens,
-                response_format={"type": "json_object"}
-            )
+            # Semaphore sits inside the retry decorator so backoff waits
+            # don't hold a slot
+            with _openai_semaphore:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature or self.temperature,
+                    max_tokens=max_tokens or self.max_tokens,
+                    response_format={"type": "json_object"}
+                )
             
             content = response.choices[0].message.content
             input_tokens = response.usage.prompt_tokens
@@ -79,7 +108,9 @@ class OpenAIService:
                 output_tokens=output_tokens,
                 estimated_cost=self.estimate_cost(input_tokens, output_tokens)
             )
-            
+
+            ai_cache.store_response(cache_key, content)
+
             return content, input_tokens, output_tokens
             
         except Exception as e:
@@ -135,7 +166,7 @@ Task: {task.title}
 Description: {task.description or "No description provided"}
 Estimated Duration: {task.estimated_duration_minutes or "Not specified"} minutes
 Complexity: {task.complexity_level}
-Context: {json.dumps(task.context_tags) if task.context_tags else "None"}
+Context: {orjson.dumps(task.context_tags).decode() if task.context_tags else "None"}
 
 User's current energy level: {session.initial_energy_level if session else "Unknown"}
 User's stress level: {session.initial_stress_level if session else "Unknown"}
@@ -174,7 +205,7 @@ Please provide a JSON response with:
         
         try:
             response_text, input_tokens, output_tokens = await self._make_api_call(messages)
-            response_data = json.loads(response_text)
+            response_data = orjson.loads(response_text)
             
             # Track API usage
             if session:
@@ -237,7 +268,7 @@ Please provide 3-5 micro-tasks that will help them start. Respond in JSON:
         
         try:
             response_text, input_tokens, output_tokens = await self._make_api_call(messages)
-            response_data = json.loads(response_text)
+            response_data = orjson.loads(response_text)
             
             if session:
                 session.track_api_usage(
@@ -274,7 +305,7 @@ Current session context:
 - Current tasks: {context.get('current_tasks', [])}
 
 Previous conversation:
-{json.dumps(conversation_history, indent=2) if conversation_history else "None"}
+{orjson.dumps(conversation_history, option=orjson.OPT_INDENT_2).decode() if conversation_history else "None"}
 
 User input: {user_input}
 """
@@ -311,7 +342,7 @@ Provide a response with:
         
         try:
             response_text, input_tokens, output_tokens = await self._make_api_call(messages)
-            response_data = json.loads(response_text)
+            response_data = orjson.loads(response_text)
             
             # Track usage and update session
             session.track_api_usage(
@@ -393,7 +424,7 @@ Please provide overwhelm assessment and support in JSON:
         
         try:
             response_text, input_tokens, output_tokens = await self._make_api_call(messages)
-            response_data = json.loads(response_text)
+            response_data = orjson.loads(response_text)
             
             if session:
                 session.track_api_usage(
@@ -582,6 +613,72 @@ Please provide overwhelm assessment and support in JSON:
         """Analyze a goal and provide insights"""
         return await self.analyze_goal_comprehensive(goal_context)
 
+    async def analyze_goals_bulk(self, goal_contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze several goals with one chat completion.
+
+        Bulk flows (imports, migrations, re-analysis sweeps) would
+        otherwise issue one API request per goal, paying per-request cost
+        and burning through the RPM rate limit. Packing the contexts into
+        a single prompt and demultiplexing the JSON response by index
+        keeps one round-trip per batch.
+        """
+        if not goal_contexts:
+            return []
+
+        goals_payload = orjson.dumps(
+            [
+                {"index": i, **context}
+                for i, context in enumerate(goal_contexts)
+            ]
+        ).decode()
+
+        user_prompt = f"""
+Please analyze each of the following goals independently:
+
+{goals_payload}
+
+Please provide a JSON response with:
+{{
+    "analyses": [
+        {{
+            "index": 0,
+            "quadrant": 2,
+            "quadrant_reasoning": "Why this quadrant fits",
+            "complexity": "low|medium|high",
+            "overwhelm_risk": "low|medium|high",
+            "breakdown": [],
+            "insights": {{}},
+            "confidence": 0.8
+        }}
+    ]
+}}
+
+Return one entry per goal, matching each goal's "index" field.
+"""
+
+        messages = [
+            {"role": "system", "content": "You are an ADHD-aware planning assistant. Always respond in valid JSON format."},
+            {"role": "user", "content": user_prompt}
+        ]
+
+        try:
+            response_text, _, _ = await self._make_api_call(messages)
+            response_data = orjson.loads(response_text)
+
+            # Demultiplex by index so out-of-order entries still land on
+            # the right goal
+            results: List[Dict[str, Any]] = [{} for _ in goal_contexts]
+            for analysis in response_data.get("analyses", []):
+                index = analysis.get("index")
+                if isinstance(index, int) and 0 <= index < len(results):
+                    results[index] = analysis
+            return results
+
+        except Exception as e:
+            logger.error("Bulk goal analysis failed", goal_count=len(goal_contexts), error=str(e))
+            # Degrade to per-goal analysis so callers still get results
+            return [await self.analyze_goal(context) for context in goal_contexts]
+
     async def break_down_task(self, breakdown_request: Dict[str, Any]) -> Dict[str, Any]:
         """Break down a task into subtasks"""
         # Create a mock Task object from the request
@@ -5,11 +5,16 @@ This service handles all goal-related operations including CRUD,
 AI analysis, milestone management, and ADHD-specific functionality.
 """
 
+import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+import orjson
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, case, cast, func, select, tuple_, update
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import JSONB
 import structlog
 
 from ..models.goal import Goal, Milestone, GoalStatus
@@ -19,9 +24,10 @@ from ..schemas.goal import (
     GoalCreate, GoalUpdate, GoalResponse, GoalListResponse,
     GoalFilters, GoalAnalysisRequest, GoalAnalysisResponse,
     MilestoneCreate, MilestoneUpdate, MilestoneResponse,
-    GoalProgressUpdate
+    GoalProgressUpdate, MILESTONE_LIST_ADAPTER, GOAL_TASK_LIST_ADAPTER
 )
 from ..services.ai_service import OpenAIService
+from ..utils.time import now
 from ..exceptions import (
     GoalNotFoundError, ValidationError, OverwhelmDetectedError
 )
@@ -29,9 +35,69 @@ from ..exceptions import (
 logger = structlog.get_logger()
 
 
+# Short-TTL cache of per-user goal overwhelm thresholds. Thresholds only
+# change on a settings edit, so a 60s window skips the User row fetch on
+# nearly every goal create while staying fresh enough to feel immediate.
+_THRESHOLD_TTL_SECONDS = 60.0
+_threshold_cache: Dict[UUID, Tuple[int, float]] = {}
+
+
+def invalidate_overwhelm_threshold(user_id: UUID) -> None:
+    """Drop the cached threshold after an ADHD profile update."""
+    _threshold_cache.pop(user_id, None)
+
+
+def _goal_keyset_anchor(cursor: UUID):
+    """Build the (priority, created_at, id) keyset of the cursor row.
+
+    The cursor is the last row's id, validated as a UUID at the route
+    boundary; an anchor subquery reads the sort-key values back from the
+    table so both sides of the row-value comparison share the columns'
+    own storage representation. priority_level is nullable, so NULLs are
+    coalesced below any real priority on both sides - a bare NULL
+    component would make the row comparison NULL and drop those rows.
+    """
+    anchor = aliased(Goal)
+    return (
+        select(
+            func.coalesce(anchor.priority_level, -1),
+            anchor.created_at,
+            anchor.id
+        )
+        .where(anchor.id == cursor)
+        .scalar_subquery()
+    )
+
+
+@lru_cache(maxsize=None)
+def _quadrant_for(urgency: int, importance: int) -> int:
+    """Map (urgency, importance) to a Sqrily quadrant, memoized.
+
+    Pure function of two small ints - at most 100 combinations, so the
+    cache is tiny and every repeat write skips the branch chain.
+    """
+    if urgency >= 7 and importance >= 7:
+        return 1  # Urgent & Important
+    elif urgency < 7 and importance >= 7:
+        return 2  # Not Urgent & Important
+    elif urgency >= 7 and importance < 7:
+        return 3  # Urgent & Not Important
+    else:
+        return 4  # Not Urgent & Not Important
+
+
 class GoalService:
     """Service class for goal operations"""
-    
+
+    # Columns a client may change, derived from the update schema so the
+    # whitelist can't drift from the API contract
+    GOAL_UPDATABLE = frozenset(GoalUpdate.model_fields)
+
+    # Changes that warrant re-running AI analysis
+    SIGNIFICANT_FIELDS = frozenset({
+        'title', 'description', 'complexity_assessment', 'estimated_effort_hours'
+    })
+
     def __init__(self, db: Session):
         self.db = db
         self.ai_service = OpenAIService()
@@ -41,9 +107,16 @@ class GoalService:
         user_id: UUID,
         page: int = 1,
         per_page: int = 20,
-        filters: Optional[GoalFilters] = None
+        filters: Optional[GoalFilters] = None,
+        after: Optional[UUID] = None
     ) -> GoalListResponse:
-        """Get paginated list of user's goals with filtering"""
+        """Get paginated list of user's goals with filtering.
+
+        When `after` (an opaque cursor from a previous response) is given,
+        keyset pagination takes over: the query seeks directly past the
+        cursor row instead of scanning and discarding OFFSET rows, so deep
+        pages cost the same as the first one.
+        """
         
         # Base query
         query = self.db.query(Goal).filter(
@@ -83,36 +156,78 @@ class GoalService:
                 query = query.filter(Goal.priority_level <= filters.max_priority)
             
             if filters.values_alignment:
-                # Filter by values alignment (JSON contains)
-                for value in filters.values_alignment:
-                    query = query.filter(Goal.values_alignment.contains([value]))
-        
-        # Order by priority and creation date
+                if self.db.get_bind().dialect.name == "postgresql":
+                    # One jsonb containment predicate covering all the
+                    # requested values, answered from the GIN index
+                    query = query.filter(
+                        Goal.values_alignment.op('@>')(
+                            cast(filters.values_alignment, JSONB)
+                        )
+                    )
+                else:
+                    # SQLite development fallback: per-value containment
+                    for value in filters.values_alignment:
+                        query = query.filter(Goal.values_alignment.contains([value]))
+        
+        # Order by priority and creation date, with id as a tiebreaker so
+        # the keyset cursor identifies a unique position
         query = query.order_by(
-            Goal.priority_level.desc(),
-            Goal.created_at.desc()
+            Goal.priority_level.desc().nulls_last(),
+            Goal.created_at.desc(),
+            Goal.id.desc()
         )
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
+
         offset = (page - 1) * per_page
-        goals = query.offset(offset).limit(per_page).all()
+        if after:
+            # Keyset: seek past the cursor row. The row-value comparison
+            # follows the DESC sort, so "next page" means strictly less.
+            query = query.filter(
+                tuple_(
+                    func.coalesce(Goal.priority_level, -1),
+                    Goal.created_at,
+                    Goal.id
+                ) < _goal_keyset_anchor(after)
+            )
+            offset = 0
+
+        # Fetch the page and the total in one round-trip: count(*) over()
+        # evaluates the filter predicates once instead of running a
+        # separate COUNT query with the same plan
+        rows = query.add_columns(
+            func.count().over().label("total")
+        ).offset(offset).limit(per_page).all()
+
+        goals = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        elif not after and page > 1:
+            # Past the last page the window returns nothing; fall back to
+            # a plain count so pagination metadata stays correct
+            total = query.order_by(None).count()
+        else:
+            total = 0
         
-        # Convert to response models
+        # Convert to response models, sharing one batch of counts for the
+        # whole page instead of three COUNT queries per goal
+        counts = self._load_goal_counts([goal.id for goal in goals])
         goal_responses = []
         for goal in goals:
-            goal_response = await self._goal_to_response(goal)
+            goal_response = await self._goal_to_response(goal, counts=counts)
             goal_responses.append(goal_response)
         
+        # In cursor mode the window total counts rows remaining after the
+        # cursor, so "more pages" means the page didn't exhaust them
+        has_next = len(goals) < total if after else offset + per_page < total
+        next_cursor = str(goals[-1].id) if goals and has_next else None
+
         return GoalListResponse(
             goals=goal_responses,
             total=total,
             page=page,
             per_page=per_page,
-            has_next=offset + per_page < total,
-            has_prev=page > 1
+            has_next=has_next,
+            has_prev=page > 1 or after is not None,
+            next_cursor=next_cursor
         )
     
     async def get_goal(self, goal_id: UUID, user_id: UUID) -> Optional[GoalResponse]:
@@ -156,19 +271,19 @@ class GoalService:
         # Calculate Sqrily quadrant based on priority and urgency
         goal.fc_quadrant = self._calculate_goal_quadrant(goal)
         
+        # Mark analysis as pending so clients know insights are coming
+        goal.ai_insights = {"status": "pending"}
+
         # Save to database first
         self.db.add(goal)
         self.db.commit()
         self.db.refresh(goal)
-        
-        # Run AI analysis asynchronously
-        try:
-            await self._run_ai_analysis(goal, goal_data.natural_language_input)
-            self.db.commit()
-        except Exception as e:
-            logger.warning("AI analysis failed", goal_id=str(goal.id), error=str(e))
-            # Continue without AI analysis - not critical
-        
+
+        # Queue AI analysis out of band - the write path returns as soon
+        # as the row is committed instead of blocking on a multi-second
+        # OpenAI round-trip
+        self._queue_ai_analysis(goal, goal_data.natural_language_input)
+
         return await self._goal_to_response(goal)
     
     async def update_goal(
@@ -189,59 +304,68 @@ class GoalService:
         
         if not goal:
             return None
-        
-        # Track if significant changes were made for AI re-analysis
-        significant_changes = False
-        
-        # Update fields
+
+        # Compute the changed subset against the whitelist, then write it
+        # with one bulk UPDATE instead of attribute-by-attribute mutation
+        # through the instrumented descriptors
         update_data = goal_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(goal, field):
-                old_value = getattr(goal, field)
-                setattr(goal, field, value)
-                
-                # Check for significant changes
-                if field in ['title', 'description', 'complexity_assessment', 'estimated_effort_hours']:
-                    if old_value != value:
-                        significant_changes = True
-        
+        changed = {
+            field: value
+            for field, value in update_data.items()
+            if field in self.GOAL_UPDATABLE and getattr(goal, field) != value
+        }
+
+        # Significant changes warrant AI re-analysis
+        significant_changes = bool(changed.keys() & self.SIGNIFICANT_FIELDS)
+
         # Recalculate quadrant if priority changed
-        if 'priority_level' in update_data:
-            goal.fc_quadrant = self._calculate_goal_quadrant(goal)
+        if 'priority_level' in changed:
+            changed['fc_quadrant'] = self._quadrant_from(
+                changed['priority_level'],
+                changed.get('target_date', goal.target_date)
+            )
             significant_changes = True
-        
-        goal.updated_at = datetime.utcnow()
-        
-        # Re-run AI analysis if significant changes
+
+        if changed:
+            changed['updated_at'] = datetime.utcnow()
+            self.db.execute(
+                update(Goal).where(Goal.id == goal_id).values(**changed)
+            )
+            self.db.commit()
+            self.db.refresh(goal)
+
+        # Re-run AI analysis out of band if significant changes
         if significant_changes:
-            try:
-                await self._run_ai_analysis(goal)
-            except Exception as e:
-                logger.warning("AI re-analysis failed", goal_id=str(goal.id), error=str(e))
-        
-        self.db.commit()
-        self.db.refresh(goal)
-        
+            self._queue_ai_analysis(goal)
+
         return await self._goal_to_response(goal)
     
     async def archive_goal(self, goal_id: UUID, user_id: UUID) -> bool:
         """Archive a goal (soft delete)"""
         
-        goal = self.db.query(Goal).filter(
-            and_(
-                Goal.id == goal_id,
-                Goal.user_id == user_id,
-                Goal.deleted_at.is_(None)
+        # One statement: the WHERE clause does the ownership check and
+        # RETURNING confirms a row was hit, replacing SELECT-then-mutate
+        archived_at = datetime.utcnow()
+        archived_id = self.db.execute(
+            update(Goal)
+            .where(
+                and_(
+                    Goal.id == goal_id,
+                    Goal.user_id == user_id,
+                    Goal.deleted_at.is_(None)
+                )
             )
-        ).first()
-        
-        if not goal:
+            .values(
+                status=GoalStatus.ARCHIVED,
+                deleted_at=archived_at,
+                updated_at=archived_at
+            )
+            .returning(Goal.id)
+        ).scalar_one_or_none()
+
+        if archived_id is None:
             return False
-        
-        goal.status = GoalStatus.ARCHIVED
-        goal.deleted_at = datetime.utcnow()
-        goal.updated_at = datetime.utcnow()
-        
+
         self.db.commit()
         return True
     
@@ -269,14 +393,34 @@ class GoalService:
         
         # Add progress notes
         if progress_update.notes:
-            if not goal.ai_insights:
-                goal.ai_insights = {}
-            goal.ai_insights["progress_notes"] = goal.ai_insights.get("progress_notes", [])
-            goal.ai_insights["progress_notes"].append({
+            note = {
                 "date": datetime.utcnow().isoformat(),
                 "notes": progress_update.notes,
                 "progress": progress_update.progress_percentage
-            })
+            }
+            if self.db.get_bind().dialect.name == "postgresql":
+                # Append atomically with jsonb_set: only the new note
+                # crosses the wire, the document never round-trips, and
+                # concurrent progress updates can't clobber each other
+                self.db.execute(
+                    sql_text(
+                        "UPDATE goals SET ai_insights = jsonb_set("
+                        "coalesce(ai_insights, '{}'::jsonb), "
+                        "'{progress_notes}', "
+                        "coalesce(ai_insights->'progress_notes', '[]'::jsonb)"
+                        " || :entry::jsonb) "
+                        "WHERE id = :goal_id"
+                    ),
+                    {"entry": orjson.dumps(note).decode(), "goal_id": goal_id}
+                )
+            else:
+                # SQLite fallback: rebuild and reassign so SQLAlchemy's
+                # change tracking sees the new document
+                insights = dict(goal.ai_insights or {})
+                notes = list(insights.get("progress_notes", []))
+                notes.append(note)
+                insights["progress_notes"] = notes
+                goal.ai_insights = insights
         
         # Handle milestone completion
         if progress_update.milestone_completed:
@@ -298,11 +442,19 @@ class GoalService:
     
     def _calculate_goal_quadrant(self, goal: Goal) -> int:
         """Calculate Sqrily quadrant for a goal"""
+        return self._quadrant_from(goal.priority_level, goal.target_date)
+
+    def _quadrant_from(self, priority_level: int, target_date: Optional[datetime]) -> int:
+        """Calculate the quadrant from raw field values.
+
+        Takes plain values so update paths can classify pending changes
+        without first writing them to the ORM instance.
+        """
         # For goals, we consider priority level and target date urgency
         urgency = 5  # Default
-        
-        if goal.target_date:
-            days_until_target = (goal.target_date - datetime.utcnow()).days
+
+        if target_date:
+            days_until_target = (target_date - now()).days
             if days_until_target <= 7:
                 urgency = 9  # Very urgent
             elif days_until_target <= 30:
@@ -311,45 +463,63 @@ class GoalService:
                 urgency = 5  # Moderate
             else:
                 urgency = 3  # Not urgent
-        
-        importance = goal.priority_level
-        
-        if urgency >= 7 and importance >= 7:
-            return 1  # Urgent & Important
-        elif urgency < 7 and importance >= 7:
-            return 2  # Not Urgent & Important
-        elif urgency >= 7 and importance < 7:
-            return 3  # Urgent & Not Important
-        else:
-            return 4  # Not Urgent & Not Important
 
-    async def _goal_to_response(self, goal: Goal) -> GoalResponse:
+        return _quadrant_for(urgency, priority_level)
+
+    def _load_goal_counts(self, goal_ids: List[UUID]) -> Dict[UUID, tuple]:
+        """Batch-load task/milestone counts for a set of goals.
+
+        Replaces the three per-goal COUNT(*) round-trips with two grouped
+        queries covering the whole page: conditional aggregation folds the
+        total and completed task counts into one pass over the task index.
+        """
+        if not goal_ids:
+            return {}
+
+        task_rows = self.db.query(
+            Task.goal_id,
+            func.count(Task.id),
+            func.sum(case((Task.status == "completed", 1), else_=0))
+        ).filter(
+            Task.goal_id.in_(goal_ids),
+            Task.deleted_at.is_(None)
+        ).group_by(Task.goal_id).all()
+
+        milestone_rows = self.db.query(
+            Milestone.goal_id,
+            func.count(Milestone.id)
+        ).filter(
+            Milestone.goal_id.in_(goal_ids)
+        ).group_by(Milestone.goal_id).all()
+
+        milestone_counts = {goal_id: count for goal_id, count in milestone_rows}
+
+        counts = {goal_id: (0, 0, milestone_counts.get(goal_id, 0)) for goal_id in goal_ids}
+        for goal_id, task_count, completed_count in task_rows:
+            counts[goal_id] = (task_count, completed_count or 0, milestone_counts.get(goal_id, 0))
+        return counts
+
+    async def _goal_to_response(
+        self,
+        goal: Goal,
+        counts: Optional[Dict[UUID, tuple]] = None
+    ) -> GoalResponse:
         """Convert Goal model to GoalResponse schema"""
 
         # Calculate computed properties
         is_overdue = goal.is_overdue if hasattr(goal, 'is_overdue') else False
+        # Request-scoped now(): one clock read per request, shared by
+        # every row in a listing instead of N utcnow() calls
         days_until_target = None
         if goal.target_date:
-            days_until_target = (goal.target_date - datetime.utcnow()).days
+            days_until_target = (goal.target_date - now()).days
 
         quadrant_name = goal.quadrant_name if hasattr(goal, 'quadrant_name') else None
 
-        # Get task counts
-        task_count = self.db.query(Task).filter(
-            and_(Task.goal_id == goal.id, Task.deleted_at.is_(None))
-        ).count()
-
-        completed_task_count = self.db.query(Task).filter(
-            and_(
-                Task.goal_id == goal.id,
-                Task.status == "completed",
-                Task.deleted_at.is_(None)
-            )
-        ).count()
-
-        milestone_count = self.db.query(Milestone).filter(
-            Milestone.goal_id == goal.id
-        ).count()
+        # Callers converting a single goal fall back to a one-goal batch
+        if counts is None:
+            counts = self._load_goal_counts([goal.id])
+        task_count, completed_task_count, milestone_count = counts.get(goal.id, (0, 0, 0))
 
         return GoalResponse(
             id=goal.id,
@@ -382,6 +552,19 @@ class GoalService:
             milestone_count=milestone_count
         )
 
+    def _queue_ai_analysis(self, goal: Goal, natural_language_input: Optional[str] = None):
+        """Queue background AI analysis for a goal.
+
+        Failure to enqueue (e.g. broker down in development) is logged
+        and swallowed - analysis is an enhancement, not critical path.
+        """
+        try:
+            # Imported lazily: tasks.ai_tasks imports this module
+            from ..tasks.ai_tasks import run_goal_ai_analysis
+            run_goal_ai_analysis.delay(str(goal.id), natural_language_input)
+        except Exception as e:
+            logger.warning("Could not queue AI analysis", goal_id=str(goal.id), error=str(e))
+
     async def _run_ai_analysis(self, goal: Goal, natural_language_input: Optional[str] = None):
         """Run AI analysis on a goal"""
         try:
@@ -415,10 +598,44 @@ class GoalService:
             # Set default values
             goal.ai_confidence = 0.5
 
+    def _goal_exists(self, goal_id: UUID, user_id: UUID) -> bool:
+        """Ownership check as a one-column probe.
+
+        Call sites that only gate on ownership don't need the full Goal
+        row; selecting just the id keeps the check to an index lookup.
+        """
+        return self.db.query(Goal.id).filter(
+            and_(
+                Goal.id == goal_id,
+                Goal.user_id == user_id,
+                Goal.deleted_at.is_(None)
+            )
+        ).limit(1).scalar() is not None
+
+    def _get_goal_overwhelm_threshold(self, user_id: UUID) -> Optional[int]:
+        """Get the user's goal overwhelm threshold through the TTL cache"""
+        entry = _threshold_cache.get(user_id)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        user = self.db.query(User).filter(User.id == user_id).first()
+        if not user:
+            return None
+
+        # Goals have a lower threshold since they're bigger commitments
+        threshold = max(3, user.get_overwhelm_threshold() // 3)
+        _threshold_cache[user_id] = (threshold, time.monotonic() + _THRESHOLD_TTL_SECONDS)
+        return threshold
+
     async def _check_user_overwhelm(self, user_id: UUID):
         """Check if user is approaching overwhelm threshold"""
 
-        # Count active goals
+        # Threshold comes from the cache on repeat writes; the active-goal
+        # count stays a live query since it changes with every create
+        threshold = self._get_goal_overwhelm_threshold(user_id)
+        if threshold is None:
+            return
+
         active_goal_count = self.db.query(Goal).filter(
             and_(
                 Goal.user_id == user_id,
@@ -427,13 +644,8 @@ class GoalService:
             )
         ).count()
 
-        # Get user's overwhelm threshold for goals (typically lower than tasks)
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if user:
-            # Goals have a lower threshold since they're bigger commitments
-            threshold = max(3, user.get_overwhelm_threshold() // 3)
-            if active_goal_count >= threshold:
-                raise OverwhelmDetectedError(active_goal_count / threshold)
+        if active_goal_count >= threshold:
+            raise OverwhelmDetectedError(active_goal_count / threshold)
 
     async def analyze_goal(
         self,
@@ -511,16 +723,8 @@ class GoalService:
     async def get_goal_tasks(self, goal_id: UUID, user_id: UUID) -> List[Dict[str, Any]]:
         """Get all tasks for a goal"""
 
-        # Verify goal ownership
-        goal = self.db.query(Goal).filter(
-            and_(
-                Goal.id == goal_id,
-                Goal.user_id == user_id,
-                Goal.deleted_at.is_(None)
-            )
-        ).first()
-
-        if not goal:
+        # Verify goal ownership without loading the row
+        if not self._goal_exists(goal_id, user_id):
             return []
 
         # Get tasks
@@ -531,23 +735,10 @@ class GoalService:
             )
         ).order_by(Task.created_at.desc()).all()
 
-        # Convert to dict format
-        task_list = []
-        for task in tasks:
-            task_dict = {
-                "id": str(task.id),
-                "title": task.title,
-                "description": task.description,
-                "status": task.status,
-                "complexity_level": task.complexity_level,
-                "progress_percentage": task.progress_percentage,
-                "due_date": task.due_date.isoformat() if task.due_date else None,
-                "created_at": task.created_at.isoformat(),
-                "is_overdue": task.is_overdue if hasattr(task, 'is_overdue') else False
-            }
-            task_list.append(task_dict)
-
-        return task_list
+        # Validate and serialize the whole list in pydantic-core so
+        # datetime formatting happens in one Rust-side pass
+        summaries = GOAL_TASK_LIST_ADAPTER.validate_python(tasks)
+        return GOAL_TASK_LIST_ADAPTER.dump_python(summaries, mode="json")
 
     async def create_milestone(
         self,
@@ -557,16 +748,8 @@ class GoalService:
     ) -> Optional[MilestoneResponse]:
         """Create a milestone for a goal"""
 
-        # Verify goal ownership
-        goal = self.db.query(Goal).filter(
-            and_(
-                Goal.id == goal_id,
-                Goal.user_id == user_id,
-                Goal.deleted_at.is_(None)
-            )
-        ).first()
-
-        if not goal:
+        # Verify goal ownership without loading the row
+        if not self._goal_exists(goal_id, user_id):
             return None
 
         # Create milestone
@@ -581,17 +764,7 @@ class GoalService:
         self.db.commit()
         self.db.refresh(milestone)
 
-        return MilestoneResponse(
-            id=milestone.id,
-            goal_id=milestone.goal_id,
-            title=milestone.title,
-            description=milestone.description,
-            target_date=milestone.target_date,
-            is_completed=milestone.is_completed,
-            completed_at=milestone.completed_at,
-            created_at=milestone.created_at,
-            updated_at=milestone.updated_at
-        )
+        return MilestoneResponse.model_validate(milestone)
 
     async def get_goal_milestones(
         self,
@@ -600,16 +773,8 @@ class GoalService:
     ) -> List[MilestoneResponse]:
         """Get all milestones for a goal"""
 
-        # Verify goal ownership
-        goal = self.db.query(Goal).filter(
-            and_(
-                Goal.id == goal_id,
-                Goal.user_id == user_id,
-                Goal.deleted_at.is_(None)
-            )
-        ).first()
-
-        if not goal:
+        # Verify goal ownership without loading the row
+        if not self._goal_exists(goal_id, user_id):
             return []
 
         # Get milestones
@@ -617,23 +782,9 @@ class GoalService:
             Milestone.goal_id == goal_id
         ).order_by(Milestone.target_date.asc()).all()
 
-        # Convert to response models
-        milestone_responses = []
-        for milestone in milestones:
-            milestone_response = MilestoneResponse(
-                id=milestone.id,
-                goal_id=milestone.goal_id,
-                title=milestone.title,
-                description=milestone.description,
-                target_date=milestone.target_date,
-                is_completed=milestone.is_completed,
-                completed_at=milestone.completed_at,
-                created_at=milestone.created_at,
-                updated_at=milestone.updated_at
-            )
-            milestone_responses.append(milestone_response)
-
-        return milestone_responses
+        # Validate the whole list in one pydantic-core pass instead of
+        # hand-building each response
+        return MILESTONE_LIST_ADAPTER.validate_python(milestones)
 
     async def update_milestone(
         self,
@@ -657,29 +808,26 @@ class GoalService:
 
         # Update fields
         update_data = milestone_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(milestone, field):
-                setattr(milestone, field, value)
 
         # Handle completion
         if milestone_data.is_completed and not milestone.is_completed:
-            milestone.completed_at = datetime.utcnow()
+            update_data['completed_at'] = datetime.utcnow()
         elif not milestone_data.is_completed and milestone.is_completed:
-            milestone.completed_at = None
-
-        milestone.updated_at = datetime.utcnow()
-
+            update_data['completed_at'] = None
+
+        update_data['updated_at'] = datetime.utcnow()
+
+        # UPDATE ... RETURNING hands back the written row directly,
+        # replacing the commit-then-refresh SELECT round-trip
+        milestone = self.db.execute(
+            update(Milestone)
+            .where(Milestone.id == milestone.id)
+            .values(**update_data)
+            .returning(Milestone)
+        ).scalar_one()
+
+        # Build the response before commit so expire_on_commit doesn't
+        # force a reload of the attributes we just got back
+        response = MilestoneResponse.model_validate(milestone)
         self.db.commit()
-        self.db.refresh(milestone)
-
-        return MilestoneResponse(
-            id=milestone.id,
-            goal_id=milestone.goal_id,
-            title=milestone.title,
-            description=milestone.description,
-            target_date=milestone.target_date,
-            is_completed=milestone.is_completed,
-            completed_at=milestone.completed_at,
-            created_at=milestone.created_at,
-            updated_at=milestone.updated_at
-        )
+        return response
@@ -7,17 +7,19 @@ and executive function support.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, delete, update
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 import structlog
 
-from ..models.subtask import Subtask, SubtaskStatus, SubtaskType, SubtaskDifficulty
+from ..models.subtask import Subtask, SubtaskStatus, SubtaskType, SubtaskDifficulty, subtask_dependencies
+from ..utils.time import now
 from ..models.task import Task
 from ..schemas.subtask import (
     SubtaskCreate, SubtaskUpdate, SubtaskResponse, SubtaskListResponse,
-    SubtaskFilters, SubtaskActionRequest
+    SubtaskFilters, SubtaskActionRequest,
+    SubtaskTypeEnum, SubtaskDifficultyEnum, SubtaskStatusEnum
 )
 
 logger = structlog.get_logger()
@@ -51,43 +53,34 @@ class SubtaskService:
         filters: Optional[SubtaskFilters] = None
     ) -> List[SubtaskResponse]:
         """Get all subtasks for a specific task"""
-        
-        # Verify task ownership
-        task = self.db.query(Task).filter(
+
+        # Ownership is enforced by the denormalized user_id filter, so no
+        # separate task lookup or JOIN is needed
+        query = self.db.query(Subtask).filter(
             and_(
-                Task.id == task_id,
-                Task.user_id == user_id,
-                Task.deleted_at.is_(None)
+                Subtask.task_id == task_id,
+                Subtask.user_id == user_id
             )
-        ).first()
-        
-        if not task:
-            return []
-        
-        # Build query
-        query = self.db.query(Subtask).filter(Subtask.task_id == task_id)
+        )
         
-        # Apply filters
+        # Apply filters (value lists are cached on the filter schema)
         if filters:
-            if filters.status:
-                query = query.filter(Subtask.status.in_([s.value for s in filters.status]))
-            if filters.subtask_type:
-                query = query.filter(Subtask.subtask_type.in_([t.value for t in filters.subtask_type]))
-            if filters.difficulty_level:
-                query = query.filter(Subtask.difficulty_level.in_([d.value for d in filters.difficulty_level]))
+            if filters.status_values:
+                query = query.filter(Subtask.status.in_(filters.status_values))
+            if filters.subtask_type_values:
+                query = query.filter(Subtask.subtask_type.in_(filters.subtask_type_values))
+            if filters.difficulty_level_values:
+                query = query.filter(Subtask.difficulty_level.in_(filters.difficulty_level_values))
             if filters.ai_generated is not None:
                 query = query.filter(Subtask.ai_generated == filters.ai_generated)
         
-        # Order by sequence
+        # Order by sequence. Dependencies selectin-load for the whole
+        # batch in one extra query, so blocked checks stay in memory.
         subtasks = query.order_by(Subtask.sequence_order, Subtask.created_at).all()
-        
-        # Convert to response objects
-        responses = []
-        for subtask in subtasks:
-            response = await self._subtask_to_response(subtask)
-            responses.append(response)
-        
-        return responses
+
+        # Conversion is pure in-memory work, so a plain comprehension
+        # beats awaiting a coroutine per row
+        return [self._subtask_to_response(subtask) for subtask in subtasks]
     
     async def get_subtask(
         self,
@@ -96,18 +89,17 @@ class SubtaskService:
     ) -> Optional[SubtaskResponse]:
         """Get a specific subtask by ID"""
         
-        subtask = self.db.query(Subtask).join(Task).filter(
+        subtask = self.db.query(Subtask).filter(
             and_(
                 Subtask.id == subtask_id,
-                Task.user_id == user_id,
-                Task.deleted_at.is_(None)
+                Subtask.user_id == user_id
             )
         ).first()
         
         if not subtask:
             return None
         
-        return await self._subtask_to_response(subtask)
+        return self._subtask_to_response(subtask)
     
     async def create_subtask(
         self,
@@ -131,11 +123,11 @@ class SubtaskService:
         # Create subtask
         subtask = Subtask(
             task_id=subtask_data.task_id,
+            user_id=user_id,
             title=subtask_data.title,
             action=subtask_data.action,
             completion_criteria=subtask_data.completion_criteria,
             sequence_order=subtask_data.sequence_order,
-            depends_on_subtask_ids=subtask_data.depends_on_subtask_ids,
             subtask_type=subtask_data.subtask_type.value,
             difficulty_level=subtask_data.difficulty_level.value,
             estimated_minutes=subtask_data.estimated_minutes,
@@ -151,50 +143,150 @@ class SubtaskService:
             ai_generated=subtask_data.ai_generated,
             ai_confidence=subtask_data.ai_confidence
         )
-        
+
+        if subtask_data.depends_on_subtask_ids:
+            subtask.dependencies = self._resolve_dependencies(
+                subtask_data.depends_on_subtask_ids
+            )
+
         self.db.add(subtask)
         self.db.commit()
         self.db.refresh(subtask)
         
         logger.info("Subtask created", subtask_id=str(subtask.id), task_id=str(subtask_data.task_id))
         
-        return await self._subtask_to_response(subtask)
+        return self._subtask_to_response(subtask)
     
-    async def update_subtask(
+    async def bulk_create_subtasks(
         self,
-        subtask_id: UUID,
         user_id: UUID,
-        subtask_data: SubtaskUpdate
-    ) -> Optional[SubtaskResponse]:
-        """Update an existing subtask"""
-        
-        subtask = self.db.query(Subtask).join(Task).filter(
+        task_id: UUID,
+        items: List[SubtaskCreate]
+    ) -> List[SubtaskResponse]:
+        """Create many subtasks (e.g. an accepted AI breakdown) at once.
+
+        Ownership is verified once for the whole batch and the rows go in
+        via a single multi-VALUES INSERT, instead of the SELECT + INSERT +
+        COMMIT per row that looping over create_subtask would cost.
+        sequence_order is assigned from list position.
+        """
+
+        # Verify task ownership once
+        task = self.db.query(Task).filter(
             and_(
-                Subtask.id == subtask_id,
+                Task.id == task_id,
                 Task.user_id == user_id,
                 Task.deleted_at.is_(None)
             )
         ).first()
-        
-        if not subtask:
-            return None
-        
-        # Update fields
+
+        if not task:
+            raise SubtaskNotFoundError(str(task_id))
+
+        if not items:
+            return []
+
+        rows = [
+            item.model_dump(
+                exclude={"task_id", "sequence_order", "depends_on_subtask_ids"}
+            )
+            for item in items
+        ]
+        created_ids = Subtask.bulk_create(self.db, task_id, user_id, rows)
+        self.db.commit()
+
+        logger.info(
+            "Subtasks bulk created",
+            task_id=str(task_id),
+            count=len(created_ids)
+        )
+
+        subtasks = self.db.query(Subtask).filter(
+            Subtask.id.in_(created_ids)
+        ).order_by(Subtask.sequence_order, Subtask.created_at).all()
+
+        return [self._subtask_to_response(subtask) for subtask in subtasks]
+
+    async def update_subtask(
+        self,
+        subtask_id: UUID,
+        user_id: UUID,
+        subtask_data: SubtaskUpdate
+    ) -> Optional[SubtaskResponse]:
+        """Update an existing subtask"""
+
         update_data = subtask_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(subtask, field):
-                if field in ['subtask_type', 'difficulty_level', 'status'] and value:
-                    setattr(subtask, field, value.value if hasattr(value, 'value') else value)
-                else:
+
+        # Dependencies live in the join table, not a plain column;
+        # reassigning them needs the ORM collection, so that path keeps
+        # the fetch-then-mutate shape
+        dependency_ids = update_data.pop('depends_on_subtask_ids', None)
+        if dependency_ids is not None:
+            subtask = self.db.query(Subtask).filter(
+                and_(
+                    Subtask.id == subtask_id,
+                    Subtask.user_id == user_id
+                )
+            ).first()
+
+            if not subtask:
+                return None
+
+            subtask.dependencies = self._resolve_dependencies(dependency_ids)
+            for field, value in update_data.items():
+                if hasattr(subtask, field):
                     setattr(subtask, field, value)
-        
-        subtask.updated_at = datetime.utcnow()
+            # Kept explicit: a dependencies-only change touches the join
+            # table, not the row, so the column onupdate would not fire
+            subtask.updated_at = now()
+            self.db.commit()
+            self.db.refresh(subtask)
+
+            logger.info("Subtask updated", subtask_id=str(subtask_id))
+            return self._subtask_to_response(subtask)
+
+        # Plain field updates collapse to one UPDATE ... RETURNING with
+        # the ownership predicate in the WHERE clause - no pre-flight
+        # SELECT and no post-commit refresh
+        values = {
+            field: value for field, value in update_data.items()
+            if hasattr(Subtask, field)
+        }
+        if not values:
+            # Empty payload - fetch once for the response, skip the
+            # UPDATE and commit entirely
+            subtask = self.db.query(Subtask).filter(
+                and_(
+                    Subtask.id == subtask_id,
+                    Subtask.user_id == user_id
+                )
+            ).first()
+            return self._subtask_to_response(subtask) if subtask else None
+
+        subtask = self.db.execute(
+            update(Subtask)
+            .where(
+                and_(
+                    Subtask.id == subtask_id,
+                    Subtask.user_id == user_id
+                )
+            )
+            .values(**values)
+            .returning(Subtask)
+            .execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+
+        if subtask is None:
+            return None
+
+        # Build the response before commit so expire_on_commit does not
+        # force a reload of the freshly returned row
+        response = self._subtask_to_response(subtask)
         self.db.commit()
-        self.db.refresh(subtask)
-        
+
         logger.info("Subtask updated", subtask_id=str(subtask_id))
-        
-        return await self._subtask_to_response(subtask)
+
+        return response
     
     async def delete_subtask(
         self,
@@ -202,23 +294,38 @@ class SubtaskService:
         user_id: UUID
     ) -> bool:
         """Delete a subtask"""
-        
-        subtask = self.db.query(Subtask).join(Task).filter(
+
+        # Ownership probe on the id only - the row itself is never needed
+        owned = self.db.query(Subtask.id).filter(
             and_(
                 Subtask.id == subtask_id,
-                Task.user_id == user_id,
-                Task.deleted_at.is_(None)
+                Subtask.user_id == user_id
             )
-        ).first()
-        
-        if not subtask:
+        ).limit(1).scalar() is not None
+
+        if not owned:
             return False
-        
-        self.db.delete(subtask)
+
+        # Clear dependency links in both directions, then drop the row -
+        # two targeted DELETEs instead of loading the object and letting
+        # the ORM cascade
+        self.db.execute(
+            delete(subtask_dependencies).where(
+                or_(
+                    subtask_dependencies.c.subtask_id == subtask_id,
+                    subtask_dependencies.c.depends_on_id == subtask_id
+                )
+            )
+        )
+        self.db.execute(
+            delete(Subtask)
+            .where(Subtask.id == subtask_id)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
-        
+
         logger.info("Subtask deleted", subtask_id=str(subtask_id))
-        
+
         return True
     
     async def perform_action(
@@ -229,11 +336,10 @@ class SubtaskService:
     ) -> Optional[SubtaskResponse]:
         """Perform an action on a subtask (start, complete, skip)"""
         
-        subtask = self.db.query(Subtask).join(Task).filter(
+        subtask = self.db.query(Subtask).filter(
             and_(
                 Subtask.id == subtask_id,
-                Task.user_id == user_id,
-                Task.deleted_at.is_(None)
+                Subtask.user_id == user_id
             )
         ).first()
         
@@ -244,7 +350,7 @@ class SubtaskService:
         
         if action == "start":
             if not subtask.can_start():
-                blocked_subtasks = await self._get_blocking_subtasks(subtask)
+                blocked_subtasks = self._get_blocking_subtasks(subtask)
                 raise SubtaskBlockedError(str(subtask_id), blocked_subtasks)
             subtask.start_subtask()
             
@@ -262,12 +368,29 @@ class SubtaskService:
         
         logger.info("Subtask action performed", subtask_id=str(subtask_id), action=action)
         
-        return await self._subtask_to_response(subtask)
+        return self._subtask_to_response(subtask)
     
-    async def _subtask_to_response(self, subtask: Subtask) -> SubtaskResponse:
+    def _resolve_dependencies(self, dependency_ids) -> List[Subtask]:
+        """Load prerequisite subtasks for assignment to .dependencies"""
+        if not dependency_ids:
+            return []
+
+        return self.db.query(Subtask).filter(
+            Subtask.id.in_(dependency_ids)
+        ).all()
+
+    @staticmethod
+    def _subtask_to_response(subtask: Subtask) -> SubtaskResponse:
         """Convert a Subtask model to SubtaskResponse"""
-        
-        return SubtaskResponse(
+
+        # Dependencies are already loaded (selectin), so these are pure
+        # in-memory checks
+        is_blocked = subtask.is_blocked
+        can_start = subtask.can_start()
+
+        # model_construct skips validation - safe here because every value
+        # comes straight off a typed ORM row
+        return SubtaskResponse.model_construct(
             id=subtask.id,
             task_id=subtask.task_id,
             title=subtask.title,
@@ -275,9 +398,11 @@ class SubtaskService:
             completion_criteria=subtask.completion_criteria,
             sequence_order=subtask.sequence_order,
             depends_on_subtask_ids=subtask.depends_on_subtask_ids,
-            subtask_type=subtask.subtask_type,
-            difficulty_level=subtask.difficulty_level,
-            status=subtask.status,
+            # Coerce model enums to the API enums by value - without
+            # validation the serializer expects the schema's own classes
+            subtask_type=SubtaskTypeEnum(subtask.subtask_type),
+            difficulty_level=SubtaskDifficultyEnum(subtask.difficulty_level),
+            status=SubtaskStatusEnum(subtask.status),
             estimated_minutes=subtask.estimated_minutes,
             actual_minutes=subtask.actual_minutes,
             energy_required=subtask.energy_required,
@@ -295,20 +420,16 @@ class SubtaskService:
             updated_at=subtask.updated_at,
             started_at=subtask.started_at,
             completed_at=subtask.completed_at,
-            is_blocked=subtask.is_blocked,
-            can_start=subtask.can_start()
+            is_blocked=is_blocked,
+            can_start=can_start
         )
     
-    async def _get_blocking_subtasks(self, subtask: Subtask) -> List[str]:
+    @staticmethod
+    def _get_blocking_subtasks(subtask: Subtask) -> List[str]:
         """Get list of subtask titles that are blocking this subtask"""
-        if not subtask.depends_on_subtask_ids:
-            return []
-        
-        blocking = self.db.query(Subtask).filter(
-            and_(
-                Subtask.id.in_(subtask.depends_on_subtask_ids),
-                Subtask.status != SubtaskStatus.COMPLETED
-            )
-        ).all()
-        
-        return [s.title for s in blocking]
+        # Dependencies selectin-load with the subtask, so this is a pure
+        # in-memory scan - no second SELECT per blocked check
+        return [
+            dep.title for dep in subtask.dependencies
+            if dep.status != SubtaskStatus.COMPLETED
+        ]
@@ -5,11 +5,14 @@ This service handles all task-related operations including CRUD,
 AI analysis, task breakdown, and ADHD-specific functionality.
 """
 
+import hashlib
+import json
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload, raiseload, aliased
+from sqlalchemy import and_, or_, cast, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
 import structlog
 
 from ..models.task import Task, TaskStatus, TaskComplexity, TaskType
@@ -27,6 +30,46 @@ from ..exceptions import (
 logger = structlog.get_logger()
 
 
+def tasks_with_subtasks_query(db: Session, user_id: UUID):
+    """Query for a user's live tasks with subtasks eagerly loaded.
+
+    Uses selectinload so the subtasks arrive in one extra round-trip for
+    the whole batch; every other relationship raises if touched so
+    accidental N+1 access fails loudly instead of silently hammering the
+    database.
+    """
+    return db.query(Task).options(
+        selectinload(Task.subtasks),
+        raiseload("*")
+    ).filter(
+        and_(
+            Task.user_id == user_id,
+            Task.deleted_at.is_(None)
+        )
+    )
+
+
+def _task_keyset_anchor(cursor: UUID):
+    """Build the (priority, created_at, id) keyset of the cursor row.
+
+    The cursor is the last row's id, validated as a UUID at the route
+    boundary; an anchor subquery reads the sort-key values back from the
+    table so both sides of the row-value comparison share the columns'
+    own storage representation. NULL priority scores sort last, so they
+    are coalesced below any real score on both sides.
+    """
+    anchor = aliased(Task)
+    return (
+        select(
+            func.coalesce(anchor.ai_priority_score, -1.0),
+            anchor.created_at,
+            anchor.id
+        )
+        .where(anchor.id == cursor)
+        .scalar_subquery()
+    )
+
+
 class TaskService:
     """Service class for task operations"""
     
@@ -39,9 +82,16 @@ class TaskService:
         user_id: UUID,
         page: int = 1,
         per_page: int = 20,
-        filters: Optional[TaskFilters] = None
+        filters: Optional[TaskFilters] = None,
+        after: Optional[UUID] = None
     ) -> TaskListResponse:
-        """Get paginated list of user's tasks with filtering"""
+        """Get paginated list of user's tasks with filtering.
+
+        When `after` (an opaque cursor from a previous response) is given,
+        keyset pagination takes over: the query seeks directly past the
+        cursor row instead of scanning and discarding OFFSET rows, so deep
+        pages cost the same as the first one.
+        """
         
         # Base query
         query = self.db.query(Task).filter(
@@ -75,9 +125,18 @@ class TaskService:
                 query = query.filter(Task.due_date >= filters.due_after)
             
             if filters.context_tags:
-                # Filter by context tags (JSON contains)
-                for tag in filters.context_tags:
-                    query = query.filter(Task.context_tags.contains([tag]))
+                if self.db.get_bind().dialect.name == "postgresql":
+                    # One jsonb containment predicate covering all the
+                    # requested tags, answered from the GIN index
+                    query = query.filter(
+                        Task.context_tags.op('@>')(
+                            cast(filters.context_tags, JSONB)
+                        )
+                    )
+                else:
+                    # SQLite development fallback: per-tag containment
+                    for tag in filters.context_tags:
+                        query = query.filter(Task.context_tags.contains([tag]))
             
             if filters.min_priority:
                 query = query.filter(Task.ai_priority_score >= filters.min_priority)
@@ -85,32 +144,61 @@ class TaskService:
             if filters.max_priority:
                 query = query.filter(Task.ai_priority_score <= filters.max_priority)
         
-        # Order by priority and creation date
+        # Order by priority and creation date, with id as a tiebreaker so
+        # the keyset cursor identifies a unique position
         query = query.order_by(
             Task.ai_priority_score.desc().nulls_last(),
-            Task.created_at.desc()
+            Task.created_at.desc(),
+            Task.id.desc()
         )
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
+
         offset = (page - 1) * per_page
-        tasks = query.offset(offset).limit(per_page).all()
-        
-        # Convert to response models
-        task_responses = []
-        for task in tasks:
-            task_response = await self._task_to_response(task)
-            task_responses.append(task_response)
-        
+        if after:
+            # Keyset: seek past the cursor row. The row-value comparison
+            # follows the DESC sort, so "next page" means strictly less.
+            query = query.filter(
+                tuple_(
+                    func.coalesce(Task.ai_priority_score, -1.0),
+                    Task.created_at,
+                    Task.id
+                ) < _task_keyset_anchor(after)
+            )
+            offset = 0
+
+        # Fetch the page and the total in one round-trip: count(*) over()
+        # evaluates the filter predicates once instead of running a
+        # separate COUNT query with the same plan
+        rows = query.add_columns(
+            func.count().over().label("total")
+        ).offset(offset).limit(per_page).all()
+
+        tasks = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        elif not after and page > 1:
+            # Past the last page the window returns nothing; fall back to
+            # a plain count so pagination metadata stays correct
+            total = query.order_by(None).count()
+        else:
+            total = 0
+
+        # Conversion is pure in-memory work, so a plain comprehension
+        # beats awaiting a coroutine per row
+        task_responses = [self._task_to_response(task) for task in tasks]
+
+        # In cursor mode the total counts rows remaining after the
+        # cursor, so "more pages" means the page didn't exhaust them
+        has_next = len(tasks) < total if after else offset + per_page < total
+        next_cursor = str(tasks[-1].id) if tasks and has_next else None
+
         return TaskListResponse(
             tasks=task_responses,
             total=total,
             page=page,
             per_page=per_page,
-            has_next=offset + per_page < total,
-            has_prev=page > 1
+            has_next=has_next,
+            has_prev=page > 1 or after is not None,
+            next_cursor=next_cursor
         )
     
     async def get_task(self, task_id: UUID, user_id: UUID) -> Optional[TaskResponse]:
@@ -127,13 +215,13 @@ class TaskService:
         if not task:
             return None
         
-        return await self._task_to_response(task)
+        return self._task_to_response(task)
     
     async def create_task(self, user_id: UUID, task_data: TaskCreate) -> TaskResponse:
         """Create a new task with AI analysis"""
         
         # Check for overwhelm before creating
-        await self._check_user_overwhelm(user_id)
+        self._check_user_overwhelm(user_id)
         
         # Create task instance
         task = Task(
@@ -165,20 +253,15 @@ class TaskService:
             task_data.importance_level
         )
         
-        # Save to database first
         self.db.add(task)
         self.db.commit()
         self.db.refresh(task)
-        
-        # Run AI analysis asynchronously
-        try:
-            await self._run_ai_analysis(task)
-            self.db.commit()
-        except Exception as e:
-            logger.warning("AI analysis failed", task_id=str(task.id), error=str(e))
-            # Continue without AI analysis - not critical
-        
-        return await self._task_to_response(task)
+
+        # AI analysis runs out of band - the response returns immediately
+        # and the priority score lands on the row when the worker finishes
+        self._queue_ai_analysis(task)
+
+        return self._task_to_response(task)
     
     async def update_task(
         self,
@@ -199,60 +282,79 @@ class TaskService:
         if not task:
             return None
         
-        # Track if significant changes were made for AI re-analysis
-        significant_changes = False
-        
-        # Update fields
         update_data = task_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(task, field):
-                old_value = getattr(task, field)
-                setattr(task, field, value)
-                
-                # Check for significant changes
-                if field in ['title', 'description', 'complexity_level', 'estimated_duration_minutes']:
-                    if old_value != value:
-                        significant_changes = True
-        
-        # Recalculate quadrant if urgency/importance changed
-        if 'urgency_level' in update_data or 'importance_level' in update_data:
+
+        # Drop fields that already hold the submitted value so a re-PUT of
+        # the current state returns without an UPDATE or commit
+        dirty = {
+            field: value for field, value in update_data.items()
+            if hasattr(task, field) and getattr(task, field) != value
+        }
+        if not dirty:
+            return self._task_to_response(task)
+
+        # Significant changes trigger AI re-analysis; dirty already excludes
+        # same-value writes, so unrelated edits never re-run the analysis
+        significant_changes = any(
+            field in dirty
+            for field in ('title', 'description', 'complexity_level', 'estimated_duration_minutes')
+        )
+
+        for field, value in dirty.items():
+            setattr(task, field, value)
+
+        # Recalculate quadrant if urgency/importance actually changed
+        if 'urgency_level' in dirty or 'importance_level' in dirty:
             task.fc_quadrant = self._calculate_quadrant(
                 task.urgency_level,
                 task.importance_level
             )
             significant_changes = True
-        
-        task.updated_at = datetime.utcnow()
-        
-        # Re-run AI analysis if significant changes
-        if significant_changes:
-            try:
-                await self._run_ai_analysis(task)
-            except Exception as e:
-                logger.warning("AI re-analysis failed", task_id=str(task.id), error=str(e))
-        
+
         self.db.commit()
         self.db.refresh(task)
-        
-        return await self._task_to_response(task)
+
+        # Re-run AI analysis out of band if significant changes
+        if significant_changes:
+            self._queue_ai_analysis(task)
+
+        return self._task_to_response(task)
     
     async def delete_task(self, task_id: UUID, user_id: UUID) -> bool:
         """Soft delete a task"""
-        
-        task = self.db.query(Task).filter(
-            and_(
-                Task.id == task_id,
-                Task.user_id == user_id,
-                Task.deleted_at.is_(None)
+
+        # Single UPDATE with the ownership predicate in the WHERE clause;
+        # RETURNING status replaces the pre-flight SELECT
+        row = self.db.execute(
+            update(Task)
+            .where(
+                and_(
+                    Task.id == task_id,
+                    Task.user_id == user_id,
+                    Task.deleted_at.is_(None)
+                )
             )
+            # updated_at comes from the column onupdate
+            .values(deleted_at=datetime.utcnow())
+            .returning(Task.status)
+            .execution_options(synchronize_session=False)
         ).first()
-        
-        if not task:
+
+        if row is None:
             return False
-        
-        task.deleted_at = datetime.utcnow()
-        task.updated_at = datetime.utcnow()
-        
+
+        # Statement-level UPDATE bypasses the ORM flush events, so the
+        # active-task counter is adjusted here when a live task leaves
+        # the active set
+        status = row.status.value if hasattr(row.status, "value") else row.status
+        if status in (TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value):
+            self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(active_task_count=User.active_task_count - 1)
+                .execution_options(synchronize_session=False)
+            )
+
         self.db.commit()
         return True
     
@@ -264,19 +366,24 @@ class TaskService:
     ) -> Optional[TaskResponse]:
         """Start working on a task"""
         
-        task = self.db.query(Task).filter(
+        # One round-trip: the task and its owner arrive together instead
+        # of a second SELECT for the user row
+        row = self.db.query(Task, User).join(
+            User, User.id == Task.user_id
+        ).filter(
             and_(
                 Task.id == task_id,
                 Task.user_id == user_id,
                 Task.deleted_at.is_(None)
             )
         ).first()
-        
-        if not task:
+
+        if not row:
             return None
-        
+
+        task, user = row
+
         # Check energy level match
-        user = self.db.query(User).filter(User.id == user_id).first()
         if user:
             current_energy = user.get_adhd_preference("current_energy_level", 5)
             if task.required_energy_level > current_energy + 2:
@@ -294,7 +401,7 @@ class TaskService:
         self.db.commit()
         self.db.refresh(task)
         
-        return await self._task_to_response(task)
+        return self._task_to_response(task)
     
     async def complete_task(
         self,
@@ -328,7 +435,7 @@ class TaskService:
         self.db.commit()
         self.db.refresh(task)
         
-        return await self._task_to_response(task)
+        return self._task_to_response(task)
 
     async def get_todays_tasks(self, user_id: UUID) -> TaskListResponse:
         """Get tasks for today (due today or scheduled for today)"""
@@ -361,7 +468,7 @@ class TaskService:
         # Convert to response format
         task_responses = []
         for task in tasks:
-            task_responses.append(await self._task_to_response(task))
+            task_responses.append(self._task_to_response(task))
 
         return TaskListResponse(
             tasks=task_responses,
@@ -384,16 +491,18 @@ class TaskService:
         else:
             return 4  # Not Urgent & Not Important
     
-    async def _task_to_response(self, task: Task) -> TaskResponse:
+    @staticmethod
+    def _task_to_response(task: Task) -> TaskResponse:
         """Convert Task model to TaskResponse schema"""
         
-        # Calculate computed properties
-        is_overdue = task.is_overdue
-        is_due_soon = task.is_due_soon
+        # is_overdue / is_due_soon / quadrant_name are computed fields on
+        # TaskResponse; only breakdown_recommended comes from the ORM row
         breakdown_recommended = task.get_breakdown_recommendation()
-        quadrant_name = task.quadrant_name
-        
-        return TaskResponse(
+
+        # model_construct skips validation - safe here because every value
+        # comes straight off a typed ORM row, and list endpoints pay this
+        # conversion once per task
+        return TaskResponse.model_construct(
             id=task.id,
             user_id=task.user_id,
             goal_id=task.goal_id,
@@ -415,7 +524,6 @@ class TaskService:
             status=task.status,
             progress_percentage=task.progress_percentage,
             fc_quadrant=task.fc_quadrant,
-            quadrant_name=quadrant_name,
             ai_priority_score=task.ai_priority_score,
             ai_suggestions=task.ai_suggestions,
             ai_confidence=task.ai_confidence,
@@ -426,11 +534,22 @@ class TaskService:
             updated_at=task.updated_at,
             started_at=task.started_at,
             completed_at=task.completed_at,
-            is_overdue=is_overdue,
-            is_due_soon=is_due_soon,
             breakdown_recommended=breakdown_recommended
         )
 
+    def _queue_ai_analysis(self, task: Task):
+        """Queue background AI analysis for a task.
+
+        Failure to enqueue (e.g. broker down in development) is logged
+        and swallowed - analysis is an enhancement, not critical path.
+        """
+        try:
+            # Imported lazily: tasks.ai_tasks imports this module
+            from ..tasks.ai_tasks import run_task_ai_analysis
+            run_task_ai_analysis.delay(str(task.id))
+        except Exception as e:
+            logger.warning("Could not queue AI analysis", task_id=str(task.id), error=str(e))
+
     async def _run_ai_analysis(self, task: Task):
         """Run AI analysis on a task"""
         try:
@@ -445,6 +564,14 @@ class TaskService:
                 "natural_language_input": task.natural_language_input
             }
 
+            # Skip the OpenAI round trip when the AI-relevant inputs have
+            # not changed since the last analysis stored on the row
+            input_hash = hashlib.md5(
+                json.dumps(task_context, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            if input_hash == task.ai_input_hash and task.ai_priority_score is not None:
+                return
+
             # Get AI analysis
             analysis = await self.ai_service.analyze_task_priority(task_context)
 
@@ -452,6 +579,7 @@ class TaskService:
                 task.ai_priority_score = analysis.get("priority_score")
                 task.ai_suggestions = analysis.get("suggestions", {})
                 task.ai_confidence = analysis.get("confidence")
+                task.ai_input_hash = input_hash
 
                 # Update quadrant if AI suggests different classification
                 ai_quadrant = analysis.get("recommended_quadrant")
@@ -464,24 +592,17 @@ class TaskService:
             task.ai_priority_score = task.calculate_priority_score()
             task.ai_confidence = 0.5
 
-    async def _check_user_overwhelm(self, user_id: UUID):
+    def _check_user_overwhelm(self, user_id: UUID):
         """Check if user is approaching overwhelm threshold"""
 
-        # Count active tasks
-        active_task_count = self.db.query(Task).filter(
-            and_(
-                Task.user_id == user_id,
-                Task.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS]),
-                Task.deleted_at.is_(None)
-            )
-        ).count()
-
-        # Get user's overwhelm threshold
+        # active_task_count is denormalized onto the user row and kept in
+        # step by Task flush events, so this is one indexed row read
+        # instead of COUNT(*) over the user's task history
         user = self.db.query(User).filter(User.id == user_id).first()
         if user:
             threshold = user.get_overwhelm_threshold()
-            if active_task_count >= threshold:
-                raise OverwhelmDetectedError(active_task_count / threshold)
+            if user.active_task_count >= threshold:
+                raise OverwhelmDetectedError(user.active_task_count / threshold)
 
     async def break_down_task(
         self,
@@ -3,9 +3,10 @@ Analytics-related background tasks for Sqrily ADHD Planner.
 """
 import structlog
 from datetime import datetime, timedelta
-from celery import current_task
+from celery import current_task, group
+from sqlalchemy import case, delete, func, select, update
 from ..celery_app import celery_app
-from ..database import get_db
+from ..database import raw_scalar, session_scope
 from ..models.user import User
 from ..models.task import Task, TaskStatus
 from ..models.goal import Goal
@@ -20,107 +21,180 @@ def check_user_overwhelm_levels(self):
     Check overwhelm levels for all active users.
     """
     try:
-        db = next(get_db())
-        
-        # Get all active users
-        users = db.query(User).filter(User.is_active == True).all()
-        
-        overwhelmed_users = 0
-        for user in users:
-            # Calculate overwhelm score based on various factors
-            overwhelm_score = calculate_user_overwhelm_score(user, db)
-            
-            if overwhelm_score > 7:  # High overwhelm threshold
-                # Trigger overwhelm alert
-                from .notification_tasks import send_overwhelm_alert
-                send_overwhelm_alert.delay(user.id, "high")
-                overwhelmed_users += 1
-                
-                logger.info(
-                    f"High overwhelm detected for user {user.email}",
-                    score=overwhelm_score
+        with session_scope() as db:
+            # Four GROUP BY aggregates cover every user at once instead of
+            # four COUNT queries per user inside the loop; the clock is
+            # read once so every filter shares the same instant
+            now = datetime.utcnow()
+            today = now.date()
+            tomorrow = today + timedelta(days=1)
+
+            overdue_counts = dict(db.query(Task.user_id, func.count()).filter(
+                Task.due_date < now,
+                Task.status != TaskStatus.COMPLETED,
+                Task.deleted_at.is_(None)
+            ).group_by(Task.user_id).all())
+
+            today_counts = dict(db.query(Task.user_id, func.count()).filter(
+                Task.due_date >= today,
+                Task.due_date < tomorrow,
+                Task.status != TaskStatus.COMPLETED,
+                Task.deleted_at.is_(None)
+            ).group_by(Task.user_id).all())
+
+            high_priority_counts = dict(db.query(Task.user_id, func.count()).filter(
+                Task.importance_level >= 8,
+                Task.status != TaskStatus.COMPLETED,
+                Task.deleted_at.is_(None)
+            ).group_by(Task.user_id).all())
+
+            session_counts = dict(db.query(AISession.user_id, func.count()).filter(
+                AISession.created_at >= now - timedelta(hours=24)
+            ).group_by(AISession.user_id).all())
+
+            users = db.query(User.id, User.email).filter(User.is_active == True).all()
+
+            overwhelmed_ids = []
+            for user_id, email in users:
+                overwhelm_score = calculate_user_overwhelm_score(
+                    overdue_counts.get(user_id, 0),
+                    today_counts.get(user_id, 0),
+                    high_priority_counts.get(user_id, 0),
+                    session_counts.get(user_id, 0)
                 )
-        
-        db.close()
-        
-        logger.info(f"Checked overwhelm levels for {len(users)} users, {overwhelmed_users} alerts sent")
-        return {"users_checked": len(users), "alerts_sent": overwhelmed_users}
-        
+
+                if overwhelm_score > 7:  # High overwhelm threshold
+                    overwhelmed_ids.append(user_id)
+
+                    logger.info(
+                        f"High overwhelm detected for user {email}",
+                        score=overwhelm_score
+                    )
+
+            if overwhelmed_ids:
+                # One group publish instead of a broker round trip per
+                # user. The alert task is addressed by name - publishing
+                # only needs the route, not the callable, so there is no
+                # cross-module import to guard against cycles
+                group(
+                    celery_app.signature(
+                        "app.tasks.notification_tasks.send_overwhelm_alert",
+                        args=(user_id, "high")
+                    )
+                    for user_id in overwhelmed_ids
+                ).apply_async()
+
+            logger.info(f"Checked overwhelm levels for {len(users)} users, {len(overwhelmed_ids)} alerts sent")
+            return {"users_checked": len(users), "alerts_sent": len(overwhelmed_ids)}
+
     except Exception as e:
         logger.error(f"Error checking overwhelm levels: {str(e)}")
         return {"error": str(e)}
 
 
-def calculate_user_overwhelm_score(user: User, db) -> float:
+def calculate_user_overwhelm_score(
+    overdue_tasks: int,
+    today_tasks: int,
+    high_priority_tasks: int,
+    recent_sessions: int
+) -> float:
     """
-    Calculate overwhelm score for a user based on various factors.
+    Calculate overwhelm score from pre-fetched per-user counts.
     """
     score = 0.0
-    
+
     # Factor 1: Number of overdue tasks
-    overdue_tasks = db.query(Task).filter(
-        Task.user_id == user.id,
-        Task.due_date < datetime.utcnow(),
-        Task.status != TaskStatus.COMPLETED,
-        Task.deleted_at.is_(None)
-    ).count()
     score += overdue_tasks * 1.5
-    
+
     # Factor 2: Number of tasks due today
-    today = datetime.utcnow().date()
-    today_tasks = db.query(Task).filter(
-        Task.user_id == user.id,
-        Task.due_date >= today,
-        Task.due_date < today + timedelta(days=1),
-        Task.status != TaskStatus.COMPLETED,
-        Task.deleted_at.is_(None)
-    ).count()
     score += today_tasks * 0.5
-    
+
     # Factor 3: Number of high-priority tasks
-    high_priority_tasks = db.query(Task).filter(
-        Task.user_id == user.id,
-        Task.priority_level == "high",
-        Task.status != TaskStatus.COMPLETED,
-        Task.deleted_at.is_(None)
-    ).count()
     score += high_priority_tasks * 1.0
-    
+
     # Factor 4: Recent AI session frequency (might indicate stress)
-    recent_sessions = db.query(AISession).filter(
-        AISession.user_id == user.id,
-        AISession.created_at >= datetime.utcnow() - timedelta(hours=24)
-    ).count()
     if recent_sessions > 10:  # More than 10 AI sessions in 24 hours
         score += 2.0
-    
+
     return min(score, 10.0)  # Cap at 10
 
 
+def _user_overwhelm_counts(db, user_id, now: datetime = None) -> tuple:
+    """Fetch the four overwhelm inputs for a single user.
+
+    Each count runs through raw_scalar - a Core execution on the
+    session's connection - since a single integer doesn't need the ORM
+    result machinery. Callers that already read the clock pass `now` in
+    so all the windows share one instant.
+    """
+    if now is None:
+        now = datetime.utcnow()
+    today = now.date()
+
+    overdue = raw_scalar(db, select(func.count()).select_from(Task).where(
+        Task.user_id == user_id,
+        Task.due_date < now,
+        Task.status != TaskStatus.COMPLETED,
+        Task.deleted_at.is_(None)
+    ))
+
+    today_tasks = raw_scalar(db, select(func.count()).select_from(Task).where(
+        Task.user_id == user_id,
+        Task.due_date >= today,
+        Task.due_date < today + timedelta(days=1),
+        Task.status != TaskStatus.COMPLETED,
+        Task.deleted_at.is_(None)
+    ))
+
+    high_priority = raw_scalar(db, select(func.count()).select_from(Task).where(
+        Task.user_id == user_id,
+        Task.importance_level >= 8,
+        Task.status != TaskStatus.COMPLETED,
+        Task.deleted_at.is_(None)
+    ))
+
+    sessions = raw_scalar(db, select(func.count()).select_from(AISession).where(
+        AISession.user_id == user_id,
+        AISession.created_at >= now - timedelta(hours=24)
+    ))
+
+    return overdue, today_tasks, high_priority, sessions
+
+
 @celery_app.task(bind=True)
 def cleanup_old_ai_sessions(self):
     """
     Clean up old AI sessions to keep the database tidy.
     """
     try:
-        db = next(get_db())
-        
-        # Delete AI sessions older than 30 days
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
-        
-        old_sessions = db.query(AISession).filter(
-            AISession.created_at < cutoff_date
-        )
-        
-        count = old_sessions.count()
-        old_sessions.delete()
-        
-        db.commit()
-        db.close()
-        
-        logger.info(f"Cleaned up {count} old AI sessions")
-        return {"sessions_cleaned": count}
-        
+        with session_scope() as db:
+            # Delete AI sessions older than 30 days in bounded batches - a
+            # single DELETE over millions of rows would hold one huge
+            # transaction and escalate locks, and the old count()+delete()
+            # pair loaded primary keys into the worker first
+            cutoff_date = datetime.utcnow() - timedelta(days=30)
+            batch_size = 10_000
+            count = 0
+
+            while True:
+                batch_ids = select(AISession.id).where(
+                    AISession.created_at < cutoff_date
+                ).limit(batch_size).scalar_subquery()
+
+                result = db.execute(
+                    delete(AISession)
+                    .where(AISession.id.in_(batch_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+
+                count += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+
+            logger.info(f"Cleaned up {count} old AI sessions")
+            return {"sessions_cleaned": count}
+
     except Exception as e:
         logger.error(f"Error cleaning up AI sessions: {str(e)}")
         return {"error": str(e)}
@@ -132,61 +206,66 @@ def generate_user_analytics(self, user_id: int):
     Generate analytics data for a specific user.
     """
     try:
-        db = next(get_db())
-        
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            logger.error(f"User {user_id} not found")
-            return {"error": "User not found"}
-        
-        # Calculate various analytics
-        analytics = {}
-        
-        # Task completion rate (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_tasks = db.query(Task).filter(
-            Task.user_id == user_id,
-            Task.created_at >= thirty_days_ago,
-            Task.deleted_at.is_(None)
-        ).all()
-        
-        if recent_tasks:
-            completed_tasks = [t for t in recent_tasks if t.status == TaskStatus.COMPLETED]
-            analytics["completion_rate"] = len(completed_tasks) / len(recent_tasks)
-        else:
-            analytics["completion_rate"] = 0.0
-        
-        # Average task duration
-        completed_with_duration = [
-            t for t in recent_tasks 
-            if t.status == TaskStatus.COMPLETED and t.actual_duration_minutes
-        ]
-        if completed_with_duration:
-            avg_duration = sum(t.actual_duration_minutes for t in completed_with_duration) / len(completed_with_duration)
-            analytics["avg_task_duration"] = avg_duration
-        else:
-            analytics["avg_task_duration"] = 0.0
-        
-        # Goal progress
-        active_goals = db.query(Goal).filter(
-            Goal.user_id == user_id,
-            Goal.status.in_(["active", "in_progress"]),
-            Goal.deleted_at.is_(None)
-        ).count()
-        analytics["active_goals"] = active_goals
-        
-        # Overwhelm score
-        analytics["current_overwhelm_score"] = calculate_user_overwhelm_score(user, db)
-        
-        # Most productive time of day (based on task completions)
-        # This would require more complex analysis in a real implementation
-        analytics["most_productive_hour"] = 10  # Default to 10 AM
-        
-        db.close()
-        
-        logger.info(f"Generated analytics for user {user_id}")
-        return analytics
-        
+        with session_scope() as db:
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                logger.error(f"User {user_id} not found")
+                return {"error": "User not found"}
+
+            # Calculate various analytics
+            analytics = {}
+
+            # Task completion rate (last 30 days) - computed in SQL so the
+            # month's tasks never get hydrated just to derive two scalars
+            now = datetime.utcnow()
+            thirty_days_ago = now - timedelta(days=30)
+            total_tasks, completed_tasks = db.query(
+                func.count(),
+                func.sum(case((Task.status == TaskStatus.COMPLETED, 1), else_=0))
+            ).select_from(Task).filter(
+                Task.user_id == user_id,
+                Task.created_at >= thirty_days_ago,
+                Task.deleted_at.is_(None)
+            ).one()
+
+            if total_tasks:
+                analytics["completion_rate"] = (completed_tasks or 0) / total_tasks
+            else:
+                analytics["completion_rate"] = 0.0
+
+            # Average task duration, aggregated server-side over completed
+            # tasks that recorded an actual duration
+            avg_duration = raw_scalar(db, select(
+                func.avg(Task.actual_duration_minutes)
+            ).where(
+                Task.user_id == user_id,
+                Task.created_at >= thirty_days_ago,
+                Task.deleted_at.is_(None),
+                Task.status == TaskStatus.COMPLETED,
+                Task.actual_duration_minutes.isnot(None)
+            ))
+            analytics["avg_task_duration"] = float(avg_duration) if avg_duration is not None else 0.0
+
+            # Goal progress
+            active_goals = raw_scalar(db, select(func.count()).select_from(Goal).where(
+                Goal.user_id == user_id,
+                Goal.status.in_(["active", "in_progress"]),
+                Goal.deleted_at.is_(None)
+            ))
+            analytics["active_goals"] = active_goals
+
+            # Overwhelm score
+            analytics["current_overwhelm_score"] = calculate_user_overwhelm_score(
+                *_user_overwhelm_counts(db, user_id, now=now)
+            )
+
+            # Most productive time of day (based on task completions)
+            # This would require more complex analysis in a real implementation
+            analytics["most_productive_hour"] = 10  # Default to 10 AM
+
+            logger.info(f"Generated analytics for user {user_id}")
+            return analytics
+
     except Exception as e:
         logger.error(f"Error generating user analytics: {str(e)}")
         return {"error": str(e)}
@@ -198,43 +277,45 @@ def update_goal_progress(self, goal_id: int):
     Update progress for a specific goal based on completed tasks.
     """
     try:
-        db = next(get_db())
-        
-        goal = db.query(Goal).filter(Goal.id == goal_id).first()
-        if not goal:
-            logger.error(f"Goal {goal_id} not found")
-            return {"error": "Goal not found"}
-        
-        # Get all tasks related to this goal
-        related_tasks = db.query(Task).filter(
-            Task.goal_id == goal_id,
-            Task.deleted_at.is_(None)
-        ).all()
-        
-        if not related_tasks:
-            logger.info(f"No tasks found for goal {goal_id}")
-            return {"message": "No tasks found for goal"}
-        
-        # Calculate progress
-        completed_tasks = [t for t in related_tasks if t.status == TaskStatus.COMPLETED]
-        progress_percentage = (len(completed_tasks) / len(related_tasks)) * 100
-        
-        # Update goal progress
-        goal.progress_percentage = progress_percentage
-        
-        # Update goal status based on progress
-        if progress_percentage == 100:
-            goal.status = "completed"
-            goal.completed_at = datetime.utcnow()
-        elif progress_percentage > 0:
-            goal.status = "in_progress"
-        
-        db.commit()
-        db.close()
-        
-        logger.info(f"Updated progress for goal {goal_id}: {progress_percentage}%")
-        return {"goal_id": goal_id, "progress": progress_percentage}
-        
+        with session_scope() as db:
+            # One aggregate round trip replaces hydrating every related task
+            total_tasks, completed_tasks = db.query(
+                func.count(),
+                func.sum(case((Task.status == TaskStatus.COMPLETED, 1), else_=0))
+            ).select_from(Task).filter(
+                Task.goal_id == goal_id,
+                Task.deleted_at.is_(None)
+            ).one()
+
+            if not total_tasks:
+                logger.info(f"No tasks found for goal {goal_id}")
+                return {"message": "No tasks found for goal"}
+
+            progress_percentage = ((completed_tasks or 0) / total_tasks) * 100
+
+            # Single statement-level UPDATE - no goal row is loaded, and the
+            # rowcount doubles as the existence check
+            values = {"progress_percentage": progress_percentage}
+            if progress_percentage == 100:
+                values["status"] = "completed"
+                values["completed_at"] = datetime.utcnow()
+            elif progress_percentage > 0:
+                values["status"] = "in_progress"
+
+            result = db.execute(
+                update(Goal)
+                .where(Goal.id == goal_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+            if result.rowcount == 0:
+                logger.error(f"Goal {goal_id} not found")
+                return {"error": "Goal not found"}
+
+            logger.info(f"Updated progress for goal {goal_id}: {progress_percentage}%")
+            return {"goal_id": goal_id, "progress": progress_percentage}
+
     except Exception as e:
         logger.error(f"Error updating goal progress: {str(e)}")
         return {"error": str(e)}
@@ -0,0 +1,36 @@
+"""
+Request-scoped clock for the Sqrly ADHD Planner.
+
+Model methods used to call datetime.utcnow() independently, which means a
+bulk update over N rows allocates N datetime objects from N clock reads.
+A middleware captures "now" once per request into a ContextVar and every
+timestamp taken during that request reuses it.
+"""
+
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Optional
+
+_request_now: ContextVar[Optional[datetime]] = ContextVar("request_now", default=None)
+
+
+def now() -> datetime:
+    """Return the timestamp cached for the current request.
+
+    Falls back to a fresh datetime.utcnow() outside a request context
+    (scripts, background workers, tests).
+    """
+    cached = _request_now.get()
+    if cached is not None:
+        return cached
+    return datetime.utcnow()
+
+
+def set_request_now(value: Optional[datetime] = None) -> Token:
+    """Pin "now" for the current context; returns a token for reset"""
+    return _request_now.set(value or datetime.utcnow())
+
+
+def reset_request_now(token: Token) -> None:
+    """Clear the pinned timestamp set by set_request_now"""
+    _request_now.reset(token)
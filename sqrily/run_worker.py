@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Celery worker runner for Sqrily ADHD Planner
+
+Starts a gevent-pooled worker. The monkey-patching below must happen
+before any other import so socket/ssl/DB calls inside the tasks yield
+cooperatively; launching celery directly works too as long as the same
+patching is applied first:
+
+    celery -A app.celery_app worker -P gevent -c 200
+"""
+
+from gevent import monkey
+monkey.patch_all()
+
+try:
+    # Make psycopg2 cooperative as well - SQLAlchemy's blocking DB calls
+    # otherwise stall every greenlet in the pool
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+except ImportError:
+    # SQLite development setups don't ship psycopg2/psycogreen
+    pass
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    """Run the Celery worker with the gevent pool"""
+    from app.celery_app import celery_app
+    from app.config import get_settings
+
+    settings = get_settings()
+
+    celery_app.worker_main([
+        "worker",
+        "--pool=gevent",
+        f"--concurrency={settings.celery_worker_concurrency}",
+        # Hand tasks only to idle slots - pairs with prefetch=1 to keep
+        # long AI tasks from delaying short reminder/analytics tasks
+        "-Ofair",
+        "--loglevel=info",
+    ])
+
+
+if __name__ == "__main__":
+    main()
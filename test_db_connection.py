@@ -21,15 +21,18 @@ try:
     from sqrily.app.config import settings
     print(f"Settings database_url: {settings.database_url}")
     
+    from sqlalchemy import text
+
     from sqrily.app.database import engine
     print("Testing database connection...")
-    
-    # Test connection
+
+    # Test connection (SQLAlchemy 2.x requires text() for raw SQL)
     with engine.connect() as conn:
-        result = conn.execute("SELECT 1")
+        result = conn.execute(text("SELECT 1"))
         print("✅ Database connection successful!")
         print(f"Test query result: {result.fetchone()}")
-        
+        print(f"Pool status: {engine.pool.status()}")
+
 except Exception as e:
     print(f"❌ Database connection failed: {e}")
     print(f"Error type: {type(e)}")